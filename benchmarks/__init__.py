@@ -0,0 +1,11 @@
+"""
+Benchmarks for formencode_jsonschema.
+
+Run each benchmark module from the repository root, e.g. ::
+
+    python -m benchmarks.bench_nesting
+
+:mod:`benchmarks.suite` runs all synthetic cases and compares them with the
+recorded baseline.
+
+"""
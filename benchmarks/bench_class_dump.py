@@ -0,0 +1,35 @@
+"""
+Cost of instantiating formencode schemas, avoided by dumping their classes.
+"""
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.cache import SchemaCache
+
+from .generators import make_schema
+from .utils import measure, format_time
+
+
+WIDTHS = (10, 100, 1000, 10000)
+
+
+def compare(json_schema, title):
+    print(title)
+    print('{:>6} {:>14} {:>14} {:>14} {:>8}'.format(
+        'width', 'instantiate', 'dump instance', 'dump class', 'saved'))
+    for width in WIDTHS:
+        schema_class = make_schema(width)
+        instantiate = measure(schema_class)
+        instance = measure(lambda: json_schema.dump(schema_class()))
+        cls = measure(lambda: json_schema.dump(schema_class))
+        print('{:>6} {:>14} {:>14} {:>14} {:>7.0%}'.format(
+            width, format_time(instantiate), format_time(instance),
+            format_time(cls), 1 - cls / instance))
+
+
+def main():
+    compare(JSONSchema(), 'Without cache')
+    # Cached instances are also compared with fields of their classes.
+    compare(JSONSchema(cache=SchemaCache()), 'With SchemaCache')
+
+
+if __name__ == '__main__':
+    main()
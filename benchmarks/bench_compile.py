@@ -0,0 +1,42 @@
+"""
+Cost of converting a wide schema through marshmallow's machinery compared
+with :func:`formencode_jsonschema.compile_schema`.
+
+"""
+import marshmallow
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema, compile_schema
+
+from .utils import measure, format_time
+
+
+WIDTHS = (10, 100, 1000)
+
+
+def make_schema(width):
+    validators = (v.UnicodeString, v.Int, v.Bool, v.Number)
+    attrs = {
+        'field{}'.format(i): validators[i % len(validators)](not_empty=i % 2)
+        for i in range(width)
+    }
+    return type('Wide{}'.format(width), (Schema,), attrs)()
+
+
+def main():
+    json_schema = JSONSchema()
+    print('{:>6} {:>14} {:>14} {:>14} {:>8}'.format(
+        'width', 'marshmallow', 'JSONSchema', 'compile', 'speedup'))
+    for width in WIDTHS:
+        schema = make_schema(width)
+        with_marshmallow = measure(
+            lambda: marshmallow.Schema.dump(json_schema, schema))
+        dump = measure(lambda: json_schema.dump(schema))
+        compiled = measure(lambda: compile_schema(schema))
+        print('{:>6} {:>14} {:>14} {:>14} {:>7.2f}x'.format(
+            width, format_time(with_marshmallow), format_time(dump),
+            format_time(compiled), with_marshmallow / compiled))
+
+
+if __name__ == '__main__':
+    main()
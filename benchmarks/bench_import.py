@@ -0,0 +1,43 @@
+"""
+Cumulative import time of ``formencode_jsonschema`` entry points, measured
+with ``python -X importtime`` in fresh interpreters.
+
+"""
+import subprocess
+import sys
+
+
+STATEMENTS = (
+    'import formencode_jsonschema',
+    'import formencode_jsonschema.loader',
+    'from formencode_jsonschema import typed',
+    'from formencode_jsonschema import JSONSchema',
+)
+
+REPEAT = 5
+
+
+def measure_import(statement) -> int:
+    """Get total of top level import times in microseconds."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    total = 0
+    for line in process.stderr.splitlines():
+        fields = line.split('|')
+        # Top level imports aren't indented.
+        if len(fields) == 3 and not fields[2].startswith('  ') and \
+                fields[1].strip().isdigit():
+            total += int(fields[1])
+    return total
+
+
+def main():
+    for statement in STATEMENTS:
+        best = min(measure_import(statement) for _ in range(REPEAT))
+        print('{:>10.1f} ms  {}'.format(best / 1000, statement))
+
+
+if __name__ == '__main__':
+    main()
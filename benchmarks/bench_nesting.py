@@ -0,0 +1,35 @@
+"""
+Cost of dumping a field wrapped by ``All``/``Pipe`` chains of growing depth.
+
+Time per nesting level should stay flat, i.e. total cost is linear in depth.
+
+"""
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema
+
+from .generators import nest
+from .utils import measure, format_time
+
+
+DEPTHS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def make_schema(depth):
+    return type('Nested{}'.format(depth), (Schema,), {
+        'name': nest(v.UnicodeString(not_empty=True), depth),
+    })()
+
+
+def main():
+    json_schema = JSONSchema()
+    print('{:>6} {:>12} {:>12}'.format('depth', 'dump', 'per level'))
+    for depth in DEPTHS:
+        schema = make_schema(depth)
+        elapsed = measure(lambda: json_schema.dump(schema))
+        print('{:>6} {:>12} {:>12}'.format(
+            depth, format_time(elapsed), format_time(elapsed / depth)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Generation time and size of an OpenAPI document for many endpoints that
+share schemas, assembled from per-endpoint :meth:`JSONSchema.dump` results
+compared with :class:`formencode_jsonschema.openapi.ComponentsBuilder`.
+
+"""
+import json
+import time
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.openapi import ComponentsBuilder
+
+from .generators import make_schema
+from .utils import format_time
+
+
+ENDPOINTS = 1000
+UNIQUE_SCHEMAS = (10, 100)
+
+
+def assemble_dumped(endpoint_schemas):
+    json_schema = JSONSchema()
+    paths = {}
+    for i, schema in enumerate(endpoint_schemas):
+        paths['/endpoint{}'.format(i)] = {'post': {'requestBody': {
+            'content': {'application/json': {
+                'schema': json_schema.dump(schema).data,
+            }},
+        }}}
+    return {'openapi': '3.0.3', 'paths': paths}
+
+
+def assemble_components(endpoint_schemas):
+    builder = ComponentsBuilder()
+    paths = {}
+    for i, schema in enumerate(endpoint_schemas):
+        paths['/endpoint{}'.format(i)] = {'post': {'requestBody': {
+            'content': {'application/json': {
+                'schema': builder.add(schema),
+            }},
+        }}}
+    return builder.build({'openapi': '3.0.3', 'paths': paths})
+
+
+def main():
+    print('{:>7} {:>12} {:>10} {:>12} {:>10}'.format(
+        'unique', 'dump time', 'dump size', 'build time', 'build size'))
+    for unique in UNIQUE_SCHEMAS:
+        classes = [make_schema(20, seed=i) for i in range(unique)]
+        endpoint_schemas = [classes[i % unique] for i in range(ENDPOINTS)]
+        row = [unique]
+        for assemble in (assemble_dumped, assemble_components):
+            start = time.perf_counter()
+            document = assemble(endpoint_schemas)
+            row.append(format_time(time.perf_counter() - start))
+            row.append('{:.1f}K'.format(len(json.dumps(document)) / 1024))
+        print('{:>7} {:>12} {:>10} {:>12} {:>10}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Cost of validating request batches with formencode's ``Schema.to_python``
+compared with rejecting invalid payloads early by
+:class:`formencode_jsonschema.prevalidation.PreValidator`.
+
+"""
+import random
+
+from formencode import Invalid, Schema, validators as v, foreach
+
+from formencode_jsonschema.prevalidation import PreValidator, validate_many
+
+from .utils import measure, format_time
+
+
+BATCH_SIZE = 1000
+INVALID_SHARES = (0.0, 0.2, 0.5)
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+    city = v.UnicodeString(not_empty=True)
+    zip_code = v.UnicodeString(if_missing=None)
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    email = v.UnicodeString(not_empty=True)
+    name = v.UnicodeString(not_empty=True)
+    age = v.Int(if_missing=None)
+    admin = v.Bool()
+    home = Address()
+    offices = foreach.ForEach(Address())
+
+
+def make_payload(rng, invalid):
+    payload = {
+        'username': 'user{}'.format(rng.randrange(10000)),
+        'email': 'user@example.com',
+        'name': 'John Doe',
+        'age': rng.randrange(100),
+        'admin': False,
+        'home': {'street': 'Main St.', 'city': 'Seoul'},
+        'offices': [{'street': 'Office St.', 'city': 'Seoul',
+                     'zip_code': '12345'}] * rng.randrange(3),
+    }
+    if invalid:
+        payload[rng.choice(['username', 'age', 'home'])] = [None]
+    return payload
+
+
+def make_batch(invalid_share, seed=0):
+    rng = random.Random(seed)
+    return [make_payload(rng, rng.random() < invalid_share)
+            for _ in range(BATCH_SIZE)]
+
+
+def validate_all(schema, batch):
+    for payload in batch:
+        try:
+            schema.to_python(payload)
+        except Invalid:
+            pass
+
+
+def prevalidate_all(prevalidator, schema, batch):
+    is_valid = prevalidator.is_valid
+    for payload in batch:
+        if not is_valid(payload):
+            continue
+        try:
+            schema.to_python(payload)
+        except Invalid:
+            pass
+
+
+def main():
+    schema = UserCreate()
+    prevalidator = PreValidator.from_schema(schema)
+    print('{:>8} {:>14} {:>14} {:>14} {:>8}'.format(
+        'invalid', 'to_python', 'prevalidate', 'pre+to_python', 'speedup'))
+    for share in INVALID_SHARES:
+        batch = make_batch(share)
+        formencode = measure(lambda: validate_all(schema, batch), repeat=3)
+        checks = measure(lambda: [prevalidator.is_valid(x) for x in batch],
+                         repeat=3)
+        combined = measure(
+            lambda: prevalidate_all(prevalidator, schema, batch), repeat=3)
+        print('{:>7.0%} {:>14} {:>14} {:>14} {:>7.2f}x'.format(
+            share, format_time(formencode), format_time(checks),
+            format_time(combined), formencode / combined))
+
+    batch = make_batch(0.2) * 10
+    print()
+    print('validate_many of {} records'.format(len(batch)))
+    for workers, processes in ((None, False), (4, False), (4, True)):
+        elapsed = measure(lambda: validate_many(
+            schema, batch, workers=workers, processes=processes,
+            prevalidator=prevalidator), repeat=1)
+        print('{:>10} {:>14}'.format(
+            'serial' if workers is None else
+            '{} {}'.format(workers, 'procs' if processes else 'threads'),
+            format_time(elapsed)))
+
+
+if __name__ == '__main__':
+    main()
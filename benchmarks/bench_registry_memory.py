@@ -0,0 +1,63 @@
+"""
+Memory of a registry of 10k converted schemas, with fragments shared by
+interning compared with the same documents held as independent dicts.
+
+"""
+import json
+import tracemalloc
+
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import compile_schema, typed
+
+
+SCHEMA_COUNT = 10000
+
+
+def make_field(i):
+    factories = (
+        lambda: v.UnicodeString(not_empty=True),
+        lambda: v.Int(),
+        lambda: v.Bool(),
+        lambda: typed.DateTimeTyped(v.UnicodeString()),
+        lambda: typed.UUIDTyped(v.UnicodeString(), required=True),
+        lambda: typed.JSONTyped({'type': 'string', 'format': 'email'},
+                                v.Email()),
+    )
+    return factories[i % len(factories)]()
+
+
+def make_schemas():
+    return [
+        type('Schema{}'.format(i), (Schema,), {
+            'field{}'.format(j): make_field(i + j) for j in range(8)
+        })
+        for i in range(SCHEMA_COUNT)
+    ]
+
+
+def measure_registry(build):
+    tracemalloc.start()
+    registry = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return registry, size
+
+
+def main():
+    schemas = make_schemas()
+    shared, shared_size = measure_registry(
+        lambda: [compile_schema(x) for x in schemas])
+    # Same documents without sharing, as plain dicts built per schema.
+    plain, plain_size = measure_registry(
+        lambda: [json.loads(json.dumps(x)) for x in shared])
+    assert plain == shared
+    print('schemas: {}'.format(SCHEMA_COUNT))
+    print('independent dicts: {:>10,} bytes'.format(plain_size))
+    print('interned:          {:>10,} bytes'.format(shared_size))
+    print('saved:             {:>10,} bytes ({:.0%})'.format(
+        plain_size - shared_size, 1 - shared_size / plain_size))
+
+
+if __name__ == '__main__':
+    main()
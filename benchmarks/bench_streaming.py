@@ -0,0 +1,60 @@
+"""
+Peak memory of writing a wide schema as JSON with ``json.dumps`` of the
+dumped document compared with
+:func:`formencode_jsonschema.streaming.iter_schema`.
+
+"""
+import io
+import json
+import tracemalloc
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.streaming import iter_schema
+
+from .generators import make_schema
+
+
+WIDTHS = (1000, 10000, 50000)
+
+
+def write_dumped(schema, out):
+    out.write(json.dumps(JSONSchema().dump(schema).data,
+                         ensure_ascii=False, separators=(',', ':')))
+
+
+def write_streamed(schema, out):
+    for chunk in iter_schema(schema):
+        out.write(chunk)
+
+
+class NullWriter(io.TextIOBase):
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+def measure_peak(write, schema):
+    out = NullWriter()
+    tracemalloc.start()
+    write(schema, out)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, out.size
+
+
+def main():
+    print('{:>6} {:>12} {:>12} {:>12}'.format(
+        'width', 'output', 'dumps peak', 'stream peak'))
+    for width in WIDTHS:
+        schema = make_schema(width)()
+        dumped, size = measure_peak(write_dumped, schema)
+        streamed, _ = measure_peak(write_streamed, schema)
+        print('{:>6} {:>11.1f}K {:>11.1f}K {:>11.1f}K'.format(
+            width, size / 1024, dumped / 1024, streamed / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Throughput of dumping cached schemas from many threads compared with a
+single thread, doing the same amount of work. Contention of locks shows up
+as threaded runs slower than the serial one.
+
+"""
+import concurrent.futures
+import threading
+import time
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.cache import SchemaCache
+
+from .generators import make_schema
+from .utils import format_time
+
+
+THREADS = (1, 2, 4, 8)
+SCHEMAS = 20
+ROUNDS = 100
+
+
+def hammer(func, items, threads):
+    """Call ``func`` with ``items`` from ``threads`` starting together."""
+    barrier = threading.Barrier(threads)
+
+    def work(_):
+        barrier.wait()
+        for x in items:
+            func(x)
+
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        list(executor.map(work, range(threads)))
+
+
+def measure_threads(json_schema, items, threads, repeat=3):
+    """Get best time of dumping ``items`` split into ``threads``."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hammer(json_schema.dump, items[::threads], threads)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    schemas = [make_schema(20, seed=i) for i in range(SCHEMAS)]
+    json_schema = JSONSchema(cache=SchemaCache())
+    items = schemas * ROUNDS
+    # Warm up the cache.
+    measure_threads(json_schema, items, max(THREADS), repeat=1)
+    serial = None
+    print('{:>8} {:>12} {:>8}'.format('threads', 'time', 'ratio'))
+    for threads in THREADS:
+        elapsed = measure_threads(json_schema, items, threads)
+        if serial is None:
+            serial = elapsed
+        print('{:>8} {:>12} {:>7.2f}x'.format(threads, format_time(elapsed),
+                                              elapsed / serial))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Generators of synthetic formencode schemas and converters for benchmarks.
+"""
+import random
+
+from formencode import Schema, validators as v, compound
+
+from formencode_jsonschema import JSONSchema, typed
+from formencode_jsonschema.converters import (DEFAULT_CONVERTERS,
+                                              ValidatorConverter)
+
+
+SIMPLE_VALIDATORS = (
+    lambda: v.UnicodeString(not_empty=True),
+    lambda: v.UnicodeString(if_missing=None),
+    lambda: v.Int(),
+    lambda: v.Number(if_missing=None),
+    lambda: v.Bool(),
+    lambda: v.PlainText(not_empty=True),
+)
+
+TYPED_VALIDATORS = (
+    lambda: typed.DateTimeTyped(v.UnicodeString()),
+    lambda: typed.UUIDTyped(v.UnicodeString(), required=True),
+    lambda: typed.DecimalTyped(v.Number(), description='Amount'),
+    lambda: typed.JSONTyped({'type': 'string', 'format': 'email'},
+                            v.Email()),
+)
+
+
+def nest(validator, depth):
+    """Wrap ``validator`` by ``depth`` levels of ``All``/``Pipe``."""
+    for i in range(depth):
+        wrapper = compound.All if i % 2 else compound.Pipe
+        validator = wrapper(validator, v.PlainText())
+    return validator
+
+
+def make_schema(width=100, depth=0, typed_share=0.0, seed=0):
+    """
+    Make formencode schema class with ``width`` fields. ``typed_share`` of
+    fields are :class:`~formencode_jsonschema.typed.JSONTyped`, and others
+    are nested by ``depth`` levels of compound validators.
+
+    """
+    rnd = random.Random(seed)
+    attrs = {}
+    for i in range(width):
+        if rnd.random() < typed_share:
+            validator = rnd.choice(TYPED_VALIDATORS)()
+        else:
+            validator = nest(rnd.choice(SIMPLE_VALIDATORS)(), depth)
+        attrs['field{}'.format(i)] = validator
+    name = 'Synthetic_w{}_d{}_t{}'.format(width, depth, int(typed_share * 100))
+    return type(name, (Schema,), attrs)
+
+
+class UnusedValidator(v.FancyValidator):
+    """Validator that never appears in generated schemas."""
+
+
+class PredicateConverter(ValidatorConverter):
+    """Custom converter without ``validator_class``, asked for every field."""
+    def can_convert(self, validator, delegate):
+        return isinstance(validator, UnusedValidator)
+
+    def convert(self, validator, delegate):
+        return {'type': 'string'}
+
+
+def make_json_schema(converter_count=0):
+    """
+    Make :class:`~formencode_jsonschema.JSONSchema` with ``converter_count``
+    custom converters in front of default converters.
+
+    """
+    converters = tuple(PredicateConverter() for _ in range(converter_count))
+
+    class CustomJSONSchema(JSONSchema):
+        __validator_converters__ = converters + DEFAULT_CONVERTERS
+
+    return CustomJSONSchema()
@@ -0,0 +1,121 @@
+"""
+Benchmark suite of :meth:`JSONSchema.dump` over synthetic schemas.
+
+Measures latency, peak memory during a dump and memory blocks retained by
+the result. Results can be saved as baseline and compared later to catch
+regressions of the converter hot path. ::
+
+    python -m benchmarks.suite                # run and print
+    python -m benchmarks.suite --save         # record baseline
+    python -m benchmarks.suite --compare      # fail on regressions
+
+Baselines depend on the machine, so record them on the machine that
+compares.
+
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import tracemalloc
+
+from .generators import make_schema, make_json_schema
+from .utils import measure, format_time
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+Case = collections.namedtuple('Case', ['name', 'width', 'depth',
+                                       'typed_share', 'converters'])
+
+CASES = (
+    Case('width-10', 10, 0, 0.0, 0),
+    Case('width-100', 100, 0, 0.0, 0),
+    Case('width-1k', 1000, 0, 0.0, 0),
+    Case('width-10k', 10000, 0, 0.0, 0),
+    Case('depth-4', 100, 4, 0.0, 0),
+    Case('depth-16', 100, 16, 0.0, 0),
+    Case('depth-64', 100, 64, 0.0, 0),
+    Case('typed-50', 100, 0, 0.5, 0),
+    Case('typed-100', 100, 0, 1.0, 0),
+    Case('converters-10', 100, 0, 0.0, 10),
+    Case('converters-100', 100, 0, 0.0, 100),
+)
+
+
+def run_case(case: Case) -> dict:
+    json_schema = make_json_schema(case.converters)
+    schema = make_schema(case.width, case.depth, case.typed_share)()
+    elapsed = measure(lambda: json_schema.dump(schema), repeat=3)
+
+    tracemalloc.start()
+    result = json_schema.dump(schema)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(x.count for x in snapshot.statistics('filename'))
+    del result
+    return {
+        'time': elapsed,
+        'peak_memory': peak,
+        'retained_memory': current,
+        'retained_blocks': blocks,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Get list of regression messages against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ('time', 'peak_memory'):
+            expected = baseline[name][metric]
+            if expected and result[metric] > expected * tolerance:
+                regressions.append('{}: {} {:.2f}x of baseline'.format(
+                    name, metric, result[metric] / expected))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--save', action='store_true',
+                        help='save results as baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='compare results with baseline')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='allowed ratio to baseline (default: 1.5)')
+    parser.add_argument('-k', dest='keyword', default='',
+                        help='run only cases whose name contains this')
+    args = parser.parse_args(argv)
+
+    results = collections.OrderedDict()
+    print('{:<16} {:>12} {:>14} {:>14} {:>10}'.format(
+        'case', 'time', 'peak memory', 'retained', 'blocks'))
+    for case in CASES:
+        if args.keyword not in case.name:
+            continue
+        result = results[case.name] = run_case(case)
+        print('{:<16} {:>12} {:>14,} {:>14,} {:>10,}'.format(
+            case.name, format_time(result['time']), result['peak_memory'],
+            result['retained_memory'], result['retained_blocks']))
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print('REGRESSION ' + message)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
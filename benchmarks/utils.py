@@ -0,0 +1,17 @@
+import timeit
+
+
+def measure(func, repeat=5, number=None):
+    """Get best time per call of ``func`` in seconds."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_time(seconds):
+    """Format seconds in human readable unit."""
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.2f} {}'.format(seconds / scale, unit)
+    return '{:.2f} ns'.format(seconds / 1e-9)
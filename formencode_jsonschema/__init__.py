@@ -1,3 +1,31 @@
-from .schema import JSONSchema
+import importlib
 
-__all__ = ['JSONSchema']
+__all__ = ['JSONSchema', 'compile_schema']
+
+# Attributes are imported on first access, so importing the package (or
+# its light modules like ``typed`` and ``loader``) doesn't import
+# marshmallow and formencode.
+_LAZY_ATTRIBUTES = {
+    'JSONSchema': 'schema',
+    'compile_schema': 'compiler',
+}
+
+_LAZY_MODULES = frozenset(['converters', 'typed'])
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return importlib.import_module('.' + name, __name__)
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             .format(__name__, name)) from None
+    value = getattr(importlib.import_module('.' + module_name, __name__),
+                    name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_MODULES)
@@ -0,0 +1,88 @@
+import argparse
+import importlib
+import sys
+
+from .bulk import BulkConversionError
+from .bundle import (build_bundle, find_schemas, write_bundle,
+                     write_binary_bundle)
+from .cache import DiskSchemaCache
+from .schema import JSONSchema
+
+
+def import_object(path):
+    """Import object from ``module:attribute`` path."""
+    module_name, _, attribute = path.partition(':')
+    if not attribute:
+        raise ValueError("Expected 'module:attribute', got {path!r}"
+                         .format(path=path))
+    obj = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def build(args):
+    schema_classes = find_schemas(args.modules)
+    json_schema_class = JSONSchema
+    if args.json_schema:
+        json_schema_class = import_object(args.json_schema)
+    disk_cache = None
+    if args.cache_dir:
+        disk_cache = DiskSchemaCache(args.cache_dir)
+    try:
+        bundle = build_bundle(schema_classes, json_schema_class, disk_cache,
+                              workers=args.workers)
+    except BulkConversionError as e:
+        for error in e.errors:
+            print('error: {}'.format(error), file=sys.stderr)
+        return 1
+    if args.format == 'binary':
+        if args.output == '-':
+            write_binary_bundle(bundle, sys.stdout.buffer)
+        else:
+            with open(args.output, 'wb') as f:
+                write_binary_bundle(bundle, f)
+    elif args.output == '-':
+        write_bundle(bundle, sys.stdout)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            write_bundle(bundle, f)
+    message = 'Built {count} schemas'.format(count=len(schema_classes))
+    if disk_cache is not None:
+        message += ' ({hits} unchanged)'.format(hits=disk_cache.hits)
+    print(message, file=sys.stderr)
+    return 0
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='python -m formencode_jsonschema')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    build_parser = subparsers.add_parser(
+        'build', help='convert schemas of modules into a bundle file')
+    build_parser.add_argument('modules', nargs='+', metavar='MODULE',
+                              help='modules that define formencode schemas')
+    build_parser.add_argument('-o', '--output', default='-',
+                              help='bundle file to write (default: stdout)')
+    build_parser.add_argument('--format', choices=('json', 'binary'),
+                              default='json',
+                              help='json, or binary for memory-mapping')
+    build_parser.add_argument('-j', '--workers', type=int, default=None,
+                              help='number of processes to convert with')
+    build_parser.add_argument('--cache-dir', metavar='DIRECTORY',
+                              help='reuse schemas converted by former builds')
+    build_parser.add_argument('--json-schema', metavar='MODULE:CLASS',
+                              help='JSONSchema subclass to convert with')
+    build_parser.set_defaults(func=build)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
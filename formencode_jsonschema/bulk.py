@@ -0,0 +1,83 @@
+import collections
+import concurrent.futures
+import math
+
+from .schema import JSONSchema
+
+
+#: Converted documents in order of schema classes, ``None`` for failures,
+#: and :class:`ConversionError` of failed schemas.
+BulkResult = collections.namedtuple('BulkResult', ['documents', 'errors'])
+
+
+class ConversionError(Exception):
+    """Error of converting a schema, that can be sent across processes."""
+    def __init__(self, schema_name, message):
+        super().__init__(schema_name, message)
+        self.schema_name = schema_name
+        self.message = message
+
+    def __str__(self):
+        return '{}: {}'.format(self.schema_name, self.message)
+
+
+class BulkConversionError(Exception):
+    """Some schemas could not be converted."""
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+    def __str__(self):
+        return '\n'.join(str(x) for x in self.errors)
+
+
+def schema_name(schema_class) -> str:
+    """Get name of schema class, ``module.ClassName``."""
+    return '{}.{}'.format(schema_class.__module__, schema_class.__qualname__)
+
+
+def _convert_chunk(json_schema_class, schema_classes):
+    json_schema = json_schema_class()
+    converted = []
+    for schema_class in schema_classes:
+        try:
+            converted.append((json_schema.dump(schema_class).data, None))
+        except Exception as e:
+            error = ConversionError(
+                schema_name(schema_class),
+                '{}: {}'.format(type(e).__name__, e))
+            converted.append((None, error))
+    return converted
+
+
+def convert_many(schema_classes, workers=None, chunksize=None,
+                 json_schema_class=JSONSchema) -> BulkResult:
+    """
+    Convert many formencode schema classes, in a process pool if
+    ``workers`` is more than 1. Failed schemas don't abort the others, and
+    their errors are collected. ::
+
+        documents, errors = convert_many(schema_classes, workers=8)
+
+    Schema classes and ``json_schema_class`` should be importable by
+    workers.
+
+    :param workers: number of worker processes.
+    :param chunksize: number of schemas sent to a worker at once.
+    :param json_schema_class: :class:`~.schema.JSONSchema` or its subclass.
+
+    """
+    schema_classes = list(schema_classes)
+    if not workers or workers <= 1 or len(schema_classes) <= 1:
+        converted = _convert_chunk(json_schema_class, schema_classes)
+    else:
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(schema_classes) / workers / 4))
+        chunks = [schema_classes[i:i + chunksize]
+                  for i in range(0, len(schema_classes), chunksize)]
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            results = executor.map(_convert_chunk,
+                                   [json_schema_class] * len(chunks), chunks)
+            converted = [x for chunk in results for x in chunk]
+    return BulkResult([x for x, _ in converted],
+                      [x for _, x in converted if x is not None])
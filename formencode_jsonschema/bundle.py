@@ -0,0 +1,104 @@
+import importlib
+import inspect
+import json
+
+from formencode.schema import Schema as FormencodeSchema
+
+from .bulk import BulkConversionError, convert_many, schema_name
+from .cache import DiskSchemaCache
+from .encoding import encode_schema
+from .fingerprint import schema_fingerprint
+from .loader import (BUNDLE_FORMAT, BUNDLE_VERSION, BINARY_HEADER,
+                     BINARY_MAGIC, BINARY_VERSION)
+from .schema import JSONSchema
+
+
+def find_schemas(module_names) -> list:
+    """
+    Import modules and find formencode schema classes defined in them.
+    Schemas are sorted by their names.
+
+    """
+    found = {}
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for _, value in inspect.getmembers(module, inspect.isclass):
+            if issubclass(value, FormencodeSchema) and \
+                    value is not FormencodeSchema and \
+                    value.__module__ == module.__name__:
+                found[schema_name(value)] = value
+    return [found[x] for x in sorted(found)]
+
+
+def build_bundle(schema_classes, json_schema_class=JSONSchema,
+                 disk_cache: DiskSchemaCache=None, workers=None) -> dict:
+    """
+    Convert schema classes into a bundle of JSON schemas, which can be
+    served by :class:`~.loader.SchemaBundle`. Raises
+    :class:`~.bulk.BulkConversionError` after trying all schemas if some of
+    them could not be converted.
+
+    :param json_schema_class: :class:`~.schema.JSONSchema` or its subclass.
+    :param disk_cache: :class:`~.cache.DiskSchemaCache` to skip schemas
+                       that are not changed since the last build.
+    :param workers: number of processes to convert schemas with.
+
+    """
+    converters = json_schema_class.__validator_converters__
+    schemas = {}
+    pending = []
+    fingerprints = {}
+    for schema_class in schema_classes:
+        document = None
+        if disk_cache is not None:
+            fingerprint = schema_fingerprint(schema_class, converters)
+            fingerprints[schema_class] = fingerprint
+            document = disk_cache.get(fingerprint)
+        if document is None:
+            pending.append(schema_class)
+        else:
+            schemas[schema_name(schema_class)] = document
+    documents, errors = convert_many(pending, workers=workers,
+                                     json_schema_class=json_schema_class)
+    for schema_class, document in zip(pending, documents):
+        if document is None:
+            continue
+        if disk_cache is not None:
+            disk_cache.set(fingerprints[schema_class], document)
+        schemas[schema_name(schema_class)] = document
+    if errors:
+        raise BulkConversionError(errors)
+    return {
+        'format': BUNDLE_FORMAT,
+        'version': BUNDLE_VERSION,
+        'schemas': schemas,
+    }
+
+
+def write_bundle(bundle: dict, fp):
+    """Write bundle into file object as JSON."""
+    json.dump(bundle, fp, sort_keys=True, separators=(',', ':'),
+              ensure_ascii=False)
+
+
+def write_binary_bundle(bundle: dict, fp):
+    """
+    Write bundle into binary file object, which can be memory-mapped by
+    :class:`~.loader.MappedBundle`.
+
+    """
+    index = {}
+    chunks = []
+    offset = 0
+    for name in sorted(bundle['schemas']):
+        encoded = encode_schema(bundle['schemas'][name])
+        index[name] = [offset, len(encoded.data), encoded.etag]
+        chunks.append(encoded.data)
+        offset += len(encoded.data)
+    index_data = json.dumps(index, sort_keys=True,
+                            separators=(',', ':')).encode('utf-8')
+    fp.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION,
+                                len(index_data)))
+    fp.write(index_data)
+    for chunk in chunks:
+        fp.write(chunk)
@@ -0,0 +1,200 @@
+import collections
+import json
+import os
+import tempfile
+import threading
+import weakref
+
+from .utils import freeze
+
+
+CacheInfo = collections.namedtuple('CacheInfo',
+                                   ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class CachedSchema(object):
+    """
+    Converted schema and its encoding, stored by :class:`JSONSchema`. The
+    document is read-only, because it is shared by dumps.
+
+    """
+    __slots__ = ('document', 'encoded')
+
+    def __init__(self, document: dict):
+        self.document = freeze(document)
+        #: :class:`~.encoding.EncodedSchema`, encoded on demand.
+        self.encoded = None
+
+
+class _Slot(object):
+    """Cached value with reference bit of CLOCK eviction."""
+    __slots__ = ('value', 'referenced')
+
+    def __init__(self, value):
+        self.value = value
+        self.referenced = False
+
+
+class SchemaCache(object):
+    """
+    Cache of converted JSON schemas, keyed by formencode schema class and
+    converters. Schema classes are held by weak references, so cached
+    entries are dropped with their classes. ::
+
+        json_schema = JSONSchema(cache=SchemaCache(maxsize=256))
+
+    It can be shared between threads. Lookups don't take the lock, and
+    recently used entries are kept by CLOCK eviction, an approximation of
+    LRU that doesn't reorder entries on hits. Counters of hits and misses
+    are approximate while threads race.
+
+    """
+    def __init__(self, maxsize=128):
+        """
+        :param maxsize: maximum number of cached schemas. ``None`` means
+                        unbounded.
+
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        # Keys in order of the clock, and position of its hand.
+        self._ring = []
+        self._hand = 0
+        self._lock = threading.Lock()
+        # Weak references of collected classes, purged under the lock.
+        self._pending_removals = []
+
+    def _discard(self, ref):
+        self._pending_removals.append(ref)
+
+    def _purge(self):
+        removed = False
+        while self._pending_removals:
+            ref = self._pending_removals.pop()
+            for key in [x for x in self._entries if x[0] is ref]:
+                del self._entries[key]
+                removed = True
+        if removed:
+            self._rebuild_ring()
+
+    def _rebuild_ring(self):
+        self._ring = [x for x in self._ring if x in self._entries]
+        if self._hand >= len(self._ring):
+            self._hand = 0
+
+    def get(self, schema_class, converters):
+        """Get cached document, or ``None``."""
+        if self._pending_removals:
+            with self._lock:
+                self._purge()
+        key = weakref.ref(schema_class), tuple(converters)
+        slot = self._entries.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        slot.referenced = True
+        self.hits += 1
+        return slot.value
+
+    def set(self, schema_class, converters, document):
+        """Store converted document."""
+        key = weakref.ref(schema_class, self._discard), tuple(converters)
+        with self._lock:
+            self._purge()
+            slot = self._entries.get(key)
+            if slot is not None:
+                slot.value = document
+                return
+            if self.maxsize is not None and self.maxsize <= 0:
+                return
+            if self.maxsize is None or len(self._ring) < self.maxsize:
+                self._ring.append(key)
+            else:
+                self._evict()
+                self._ring[self._hand] = key
+                self._hand = (self._hand + 1) % len(self._ring)
+            self._entries[key] = _Slot(document)
+
+    def _evict(self):
+        # Skip entries referenced since the hand passed them last time.
+        while True:
+            slot = self._entries[self._ring[self._hand]]
+            if not slot.referenced:
+                break
+            slot.referenced = False
+            self._hand = (self._hand + 1) % len(self._ring)
+        del self._entries[self._ring[self._hand]]
+
+    def invalidate(self, schema_class):
+        """Drop cached documents of ``schema_class`` for all converters."""
+        with self._lock:
+            self._purge()
+            for key in [x for x in self._entries if x[0]() is schema_class]:
+                del self._entries[key]
+            self._rebuild_ring()
+
+    def clear(self):
+        """Drop all cached documents and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            del self._ring[:]
+            self._hand = 0
+            del self._pending_removals[:]
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Get statistics of cache like :func:`functools.lru_cache`."""
+        with self._lock:
+            self._purge()
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._entries))
+
+    def __len__(self):
+        return self.cache_info().currsize
+
+
+class DiskSchemaCache(object):
+    """
+    Persistent cache of converted JSON schemas in a directory, keyed by
+    :func:`~.fingerprint.schema_fingerprint`. Unchanged schemas are not
+    converted again across processes. ::
+
+        cache = DiskSchemaCache('.schema-cache')
+        fingerprint = schema_fingerprint(UserCreate)
+        document = cache.get(fingerprint)
+
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint + '.json')
+
+    def get(self, fingerprint):
+        """Get cached document, or ``None``."""
+        try:
+            with open(self._path(fingerprint), encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return document
+
+    def set(self, fingerprint, document):
+        """Store document atomically."""
+        fd, path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(document, f, sort_keys=True,
+                          separators=(',', ':'))
+            os.replace(path, self._path(fingerprint))
+        except BaseException:
+            os.unlink(path)
+            raise
@@ -0,0 +1,25 @@
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (DEFAULT_CONVERTERS, ConversionContext,
+                         get_converter_index)
+
+
+def compile_schema(schema: FormencodeSchema, converters=DEFAULT_CONVERTERS,
+                   context: ConversionContext=None) -> dict:
+    """
+    Convert formencode schema into JSON schema without marshmallow. ::
+
+        >>> compile_schema(UserCreate)
+        {'type': 'object', 'properties': {...}, 'required': [...]}
+
+    Nested schemas are placed in ``definitions`` and referenced by ``$ref``.
+
+    :param schema: formencode schema or its class.
+    :param converters: validator converters.
+    :param context: :class:`~.converters.ConversionContext` to use instead of
+                    making new one from ``converters``.
+
+    """
+    if context is None:
+        context = ConversionContext(get_converter_index(converters))
+    return context.convert_document(schema)
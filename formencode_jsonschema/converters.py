@@ -1,12 +1,22 @@
 import abc
+import collections
+import functools
+import operator
+import re
+import threading
 
-from formencode import validators as v, compound
+from formencode import validators as v, compound, foreach
 from formencode.api import Validator, NoDefault
+from formencode.schema import Schema as FormencodeSchema
 
 from .typed import JSONTyped
-from .utils import get_type_base
+from .utils import get_type_base, freeze, intern_fragment
 
 
+#: Version of output of default converters. Bump it when output changes,
+#: so fingerprints of schemas change too.
+CONVERTERS_VERSION = 4
+
 TYPE_MAPPING = {
     v.ByteString: bytes,
     v.StringBool: str,
@@ -29,9 +39,43 @@ class SchemaDelegate(object):
     def is_required(self, validator: Validator):
         raise NotImplementedError
 
+    def convert_subschema(self, schema: FormencodeSchema):
+        raise NotImplementedError
+
 
 class ValidatorConverter(metaclass=abc.ABCMeta):
     """Base class for validator converters."""
+
+    #: Base class of validators that this converter can handle.
+    #: ``None`` means that any validator may be acceptable.
+    validator_class = None
+
+    def match_class(self, validator_class):
+        """
+        Classify validator class for :class:`ConverterIndex`.
+
+        Returns ``False`` when no instance of ``validator_class`` can be
+        converted, ``True`` when every instance can be converted, and
+        ``None`` when :meth:`can_convert` should be asked for each validator.
+
+        """
+        if self.validator_class is not None and \
+                not issubclass(validator_class, self.validator_class):
+            return False
+        return None
+
+    def _match_exactly(self, validator_class, owner):
+        """
+        Match subclasses of :attr:`validator_class` exactly, unless
+        :meth:`can_convert` of ``owner`` is overridden by a subclass.
+
+        """
+        if not issubclass(validator_class, self.validator_class):
+            return False
+        if type(self).can_convert is not owner.can_convert:
+            return None
+        return True
+
     @abc.abstractmethod
     def can_convert(self, validator: Validator, delegate: SchemaDelegate):
         """Check acceptability."""
@@ -68,8 +112,11 @@ class SimpleValidatorConverter(ValidatorConverter):
         self.validator_class = validator_class
         self.python_type = python_type
 
+    def match_class(self, validator_class):
+        return self._match_exactly(validator_class, SimpleValidatorConverter)
+
     def can_convert(self, validator: Validator, delegate: SchemaDelegate):
-        return isinstance(validator, self.validator_class)
+        return issubclass(validator_class(validator), self.validator_class)
 
     def convert(self, validator: Validator, delegate: SchemaDelegate):
         converted = get_type_base(self.python_type)
@@ -77,18 +124,235 @@ class SimpleValidatorConverter(ValidatorConverter):
         return converted
 
 
+class ConstrainedValidatorConverter(SimpleValidatorConverter):
+    """
+    Simple converter that also emits JSON schema keywords of constraints of
+    validators, e.g. ``minLength`` from ``min`` of ``UnicodeString``.
+
+    """
+    #: JSON schema keywords by names of validator attributes.
+    constraints = {}
+
+    #: Whether constraints apply to stripped values. They are omitted for
+    #: validators with ``strip``, which accept surrounding whitespace.
+    applies_to_stripped = False
+
+    def __init__(self, validator_class, python_type):
+        super().__init__(validator_class, python_type)
+        names = self.key_attributes()
+        # Types are part of keys, because ``1 == 1.0 == True`` in python.
+        # They are taken by the same getter to keep lookups cheap.
+        names += [x + '.__class__' for x in names]
+        self._get_key = operator.attrgetter(*names) if names else \
+            (lambda validator: ())
+        # Converted fragments by keys of validators.
+        self._converted = {}
+
+    def key_attributes(self) -> list:
+        """
+        Get names of attributes of validators that constraints depend on.
+        Validators with equal attributes are converted once.
+
+        """
+        names = list(self.constraints)
+        if self.applies_to_stripped:
+            names.append('strip')
+        return names
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        try:
+            key = self._get_key(validator)
+            return self._converted[key]
+        except (AttributeError, TypeError):
+            # Validators without the attributes or with unhashable ones
+            # are converted every time.
+            key = None
+        except KeyError:
+            pass
+        converted = super().convert(validator, delegate)
+        stripped = self.applies_to_stripped and \
+            bool(getattr(validator, 'strip', False))
+        constraints = {} if stripped else self.get_constraints(validator)
+        if constraints:
+            converted = converted.copy()
+            converted.update(constraints)
+            converted = intern_fragment(converted)
+        if key is not None:
+            self._converted[key] = converted
+        return converted
+
+    def get_constraints(self, validator: Validator) -> dict:
+        """Get JSON schema keywords of constraints of ``validator``."""
+        constraints = {}
+        for name, keyword in self.constraints.items():
+            value = getattr(validator, name, None)
+            if value is not None:
+                constraints[keyword] = value
+        return constraints
+
+
+class LengthValidatorConverter(ConstrainedValidatorConverter):
+    """Convert ``min`` and ``max`` of string validators into lengths."""
+    constraints = {
+        'min': 'minLength',
+        'max': 'maxLength',
+    }
+    applies_to_stripped = True
+
+
+class RangeValidatorConverter(ConstrainedValidatorConverter):
+    """Convert ``min`` and ``max`` of number validators into bounds."""
+    constraints = {
+        'min': 'minimum',
+        'max': 'maximum',
+    }
+
+
+# Python only syntax after ``(?``: inline flags, comments, conditionals and
+# atomic groups.
+_UNPORTABLE_GROUPS = frozenset('aiLmsux-#(>')
+
+
+@functools.lru_cache(maxsize=1024)
+def portable_pattern(regex: str):
+    """
+    Translate Python ``regex`` into ECMA 262 regular expression for
+    ``pattern``. ``\\A``, ``\\Z`` and named groups are translated. Get
+    ``None`` if ``regex`` uses syntax that can not be translated.
+    Translations are memoized.
+
+    """
+    translated = []
+    i = 0
+    in_class = False
+    while i < len(regex):
+        char = regex[i]
+        if char == '\\':
+            escape = regex[i:i + 2]
+            if not in_class and escape == '\\A':
+                escape = '^'
+            elif not in_class and escape == '\\Z':
+                escape = '$'
+            translated.append(escape)
+            i += 2
+        elif in_class:
+            in_class = char != ']'
+            translated.append(char)
+            i += 1
+        elif char == '[':
+            # ``]`` right after ``[`` or ``[^`` is a literal.
+            end = i + 1
+            if regex.startswith('^', end):
+                end += 1
+            if regex.startswith(']', end):
+                end += 1
+            in_class = True
+            translated.append(regex[i:end])
+            i = end
+        elif regex.startswith('(?P<', i):
+            translated.append('(?<')
+            i += 4
+        elif regex.startswith('(?P=', i):
+            end = regex.find(')', i)
+            if end < 0:
+                return None
+            translated.append('\\k<{}>'.format(regex[i + 4:end]))
+            i = end + 1
+        elif regex.startswith('(?', i) and \
+                regex[i + 2:i + 3] in _UNPORTABLE_GROUPS:
+            return None
+        elif char in '*+?}' and regex.startswith('+', i + 1):
+            # Possessive quantifiers.
+            return None
+        else:
+            translated.append(char)
+            i += 1
+    return ''.join(translated)
+
+
+class RegexValidatorConverter(ConstrainedValidatorConverter):
+    """
+    Convert ``regex`` of ``Regex`` validators into ``pattern``. Patterns
+    with flags or syntax of Python only are omitted, because JSON schema can
+    not express them.
+
+    """
+    applies_to_stripped = True
+
+    def key_attributes(self) -> list:
+        # Compiled patterns are equal by their patterns and flags.
+        return ['regex', 'regexOps', 'strip']
+
+    def get_constraints(self, validator: Validator) -> dict:
+        regex = getattr(validator, 'regex', None)
+        if regex is None or getattr(validator, 'regexOps', None):
+            return {}
+        if not isinstance(regex, str):
+            if regex.flags & ~re.UNICODE:
+                return {}
+            regex = regex.pattern
+        if not isinstance(regex, str):
+            return {}
+        regex = portable_pattern(regex)
+        if regex is None:
+            return {}
+        return {'pattern': regex}
+
+
+def _enum_order(value):
+    return value is None, type(value).__name__, value
+
+
+class OneOfValidatorConverter(ValidatorConverter):
+    """
+    Convert ``OneOf`` validator into ``enum``, if its values can be
+    represented in JSON.
+
+    """
+    validator_class = v.OneOf
+
+    #: Python types of values that can be listed in ``enum``.
+    enum_types = (str, int, float, bool, type(None))
+
+    def match_class(self, validator_class):
+        return self._match_exactly(validator_class, OneOfValidatorConverter)
+
+    def can_convert(self, validator: Validator, delegate: SchemaDelegate):
+        return issubclass(validator_class(validator), self.validator_class)
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        values = validator.list
+        if values is None or \
+                not all(isinstance(x, self.enum_types) for x in values):
+            return freeze({})
+        if isinstance(values, (set, frozenset)):
+            # Order of sets changes with hash seeds.
+            values = sorted(values, key=_enum_order)
+        converted = {'enum': list(values)}
+        if validator.testValueList:
+            converted = {'type': 'array', 'items': converted}
+        return intern_fragment(converted)
+
+
 class TypedValidatorConverter(ValidatorConverter):
     """
     Convert validator that wraped by typed validator.
     """
+    validator_class = JSONTyped
+
+    def match_class(self, validator_class):
+        return self._match_exactly(validator_class, TypedValidatorConverter)
+
     def can_convert(self, validator: Validator, delegate: SchemaDelegate):
         return isinstance(validator, JSONTyped)
 
     def convert(self, validator: Validator, delegate: SchemaDelegate):
-        json_schema_type = (validator.json_type or {}).copy()
-        if validator.description is not None:
-            json_schema_type['description'] = validator.description
-        return json_schema_type
+        json_schema_type = validator.json_type or {}
+        if validator.description is None:
+            return freeze(json_schema_type)
+        json_schema_type = dict(json_schema_type)
+        json_schema_type['description'] = validator.description
+        return intern_fragment(json_schema_type)
 
     def is_required(self, validator: Validator, delegate: SchemaDelegate):
         if validator.required is not NoDefault:
@@ -100,6 +364,8 @@ class AllValidatorConverter(ValidatorConverter):
     """
     Convert ``All`` validator using first validator.
     """
+    validator_class = compound.All
+
     def can_convert(self, validator: Validator, delegate: SchemaDelegate):
         if not isinstance(validator, compound.All):
             return False
@@ -115,8 +381,10 @@ class AllValidatorConverter(ValidatorConverter):
 
 class PipeValidatorConverter(ValidatorConverter):
     """
-    Convert ``All`` validator using last validator.
+    Convert ``Pipe`` validator using last validator.
     """
+    validator_class = compound.Pipe
+
     def can_convert(self, validator: Validator, delegate: SchemaDelegate):
         if not isinstance(validator, compound.Pipe):
             return False
@@ -129,13 +397,429 @@ class PipeValidatorConverter(ValidatorConverter):
         is_required = super().is_required
         return all(is_required(x, delegate) for x in validator.validators)
 
+
+class ForEachValidatorConverter(ValidatorConverter):
+    """
+    Convert ``ForEach`` validator into array using first validator for items.
+    """
+    validator_class = foreach.ForEach
+
+    def can_convert(self, validator: Validator, delegate: SchemaDelegate):
+        if not isinstance(validator, foreach.ForEach):
+            return False
+        if not validator.validators:
+            return True
+        return delegate.can_convert(validator.validators[0])
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        if not validator.validators:
+            return get_type_base(list)
+        return intern_fragment({
+            'type': 'array',
+            'items': delegate.convert_validator(validator.validators[0]),
+        })
+
+
+class SchemaValidatorConverter(ValidatorConverter):
+    """
+    Convert nested ``Schema`` into reference of its definition.
+    """
+    validator_class = FormencodeSchema
+
+    def match_class(self, validator_class):
+        return self._match_exactly(validator_class, SchemaValidatorConverter)
+
+    def can_convert(self, validator: Validator, delegate: SchemaDelegate):
+        return issubclass(validator_class(validator), self.validator_class)
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        return delegate.convert_subschema(validator)
+
+
+class RegistryConverter(ValidatorConverter):
+    """
+    Converter that dispatches to converters in
+    :class:`~.registry.ConverterRegistry`. It comes first in
+    :data:`DEFAULT_CONVERTERS`, so plugins take precedence. ::
+
+        default_registry.register(validators.Email, EmailConverter)
+        JSONSchema().dump(UserCreate)
+
+    Validator classes are classified once, so register converters before
+    validators of their classes are converted.
+
+    """
+    def __init__(self, registry=None):
+        """
+        :param registry: :class:`~.registry.ConverterRegistry` to dispatch,
+                         or ``None`` for :data:`~.registry.default_registry`.
+
+        """
+        self._registry = registry
+        # ``(converter, exact)`` pairs by validator classes.
+        self._candidates = {}
+        self._lock = threading.Lock()
+
+    @property
+    def registry(self):
+        registry = self._registry
+        if registry is None:
+            # The registry module imports this module.
+            from .registry import default_registry
+            registry = self._registry = default_registry
+        return registry
+
+    def candidates(self, validator_class):
+        """Get loaded ``(converter, exact)`` pairs of ``validator_class``."""
+        try:
+            return self._candidates[validator_class]
+        except KeyError:
+            pass
+        with self._lock:
+            try:
+                return self._candidates[validator_class]
+            except KeyError:
+                pass
+            candidates = []
+            for converter in self.registry.converters_for(validator_class):
+                matched = converter.match_class(validator_class)
+                if matched is not False:
+                    candidates.append((converter, matched is True))
+            candidates = tuple(candidates)
+            self._candidates[validator_class] = candidates
+            return candidates
+
+    def match_class(self, validator_class):
+        if not self.candidates(validator_class):
+            return False
+        return None
+
+    def find(self, validator: Validator, delegate: SchemaDelegate):
+        """Find registered converter that can convert ``validator``."""
+        for converter, exact in self.candidates(validator_class(validator)):
+            if exact or converter.can_convert(validator, delegate):
+                return converter
+        return None
+
+    def can_convert(self, validator: Validator, delegate: SchemaDelegate):
+        return self.find(validator, delegate) is not None
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        return self.find(validator, delegate).convert(validator, delegate)
+
+    def is_required(self, validator: Validator, delegate: SchemaDelegate):
+        return self.find(validator, delegate).is_required(validator,
+                                                          delegate)
+
+#: Converter classes of validators in ``TYPE_MAPPING`` that have
+#: constraints.
+CONSTRAINED_CONVERTERS = {
+    v.ByteString: LengthValidatorConverter,
+    v.UnicodeString: LengthValidatorConverter,
+    v.Int: RangeValidatorConverter,
+    v.Number: RangeValidatorConverter,
+    v.Regex: RegexValidatorConverter,
+}
+
 #: Define simple converters
-SIMPLE_CONVERTERS = tuple(SimpleValidatorConverter(x, y)
-                          for x, y in TYPE_MAPPING.items())
+SIMPLE_CONVERTERS = tuple(
+    CONSTRAINED_CONVERTERS.get(x, SimpleValidatorConverter)(x, y)
+    for x, y in TYPE_MAPPING.items())
 
-#: Default converters
-DEFAULT_CONVERTERS = SIMPLE_CONVERTERS + (
+#: Default converters. Converters of the registry come first.
+DEFAULT_CONVERTERS = (RegistryConverter(),) + SIMPLE_CONVERTERS + (
+    OneOfValidatorConverter(),
     TypedValidatorConverter(),
     AllValidatorConverter(),
     PipeValidatorConverter(),
+    ForEachValidatorConverter(),
+    SchemaValidatorConverter(),
 )
+
+
+def validator_class(validator) -> type:
+    """
+    Get class of validator. Formencode allows validator classes to be used
+    as validators, and they are classified as themselves.
+
+    """
+    if isinstance(validator, type):
+        return validator
+    return type(validator)
+
+
+class ConverterIndex(object):
+    """
+    Dispatch table of converters, indexed by validator class.
+
+    Converters are classified once per validator class with
+    :meth:`ValidatorConverter.match_class`, so converters that can not handle
+    the class are never asked again. Order of converters is preserved.
+
+    It is shared between threads. Lookups don't take the lock, and each
+    validator class is classified only once under the lock.
+
+    """
+    def __init__(self, converters):
+        self.converters = tuple(converters)
+        self._candidates = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, validator_class):
+        """
+        Get ``(converter, exact)`` pairs that may convert instances of
+        ``validator_class``. When ``exact`` is false,
+        :meth:`ValidatorConverter.can_convert` still has to be checked.
+
+        """
+        try:
+            return self._candidates[validator_class]
+        except KeyError:
+            pass
+        with self._lock:
+            try:
+                return self._candidates[validator_class]
+            except KeyError:
+                pass
+            candidates = []
+            for converter in self.converters:
+                matched = converter.match_class(validator_class)
+                if matched is False:
+                    continue
+                candidates.append((converter, matched is True))
+            candidates = tuple(candidates)
+            self._candidates[validator_class] = candidates
+            return candidates
+
+    def find(self, validator: Validator, delegate: SchemaDelegate):
+        """Find first converter that can convert ``validator``."""
+        for converter, exact in self.candidates(validator_class(validator)):
+            if exact or converter.can_convert(validator, delegate):
+                return converter
+        return None
+
+    def find_all(self, validator: Validator, delegate: SchemaDelegate):
+        """Find all converters that can convert ``validator``."""
+        return [converter
+                for converter, exact in
+                self.candidates(validator_class(validator))
+                if exact or converter.can_convert(validator, delegate)]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_converter_index(converters) -> ConverterIndex:
+    """Get shared :class:`ConverterIndex` for tuple of converters."""
+    converters = tuple(converters)
+    try:
+        return _indexes[converters]
+    except KeyError:
+        pass
+    with _indexes_lock:
+        try:
+            return _indexes[converters]
+        except KeyError:
+            pass
+        index = _indexes[converters] = ConverterIndex(converters)
+        return index
+
+
+def schema_key(schema: FormencodeSchema):
+    """
+    Get key that identifies fields of formencode schema. It is the class of
+    ``schema`` unless fields of the instance differ from its class.
+
+    """
+    if isinstance(schema, type):
+        return schema
+    schema_class = type(schema)
+    fields = schema.fields
+    class_fields = schema_class.fields
+    if len(fields) != len(class_fields):
+        return schema
+    for name, validator in fields.items():
+        if class_fields.get(name) is not validator:
+            return schema
+    return schema_class
+
+
+#: Conversion plan of a field of formencode schema.
+FieldPlan = collections.namedtuple('FieldPlan',
+                                   ['name', 'validator', 'converter',
+                                    'required'])
+
+
+class ConversionContext(SchemaDelegate):
+    """
+    Delegate for a single conversion.
+
+    Decisions of converters are memoized by identity of validators, so each
+    validator is classified only once, even when it is wrapped by compound
+    validators. Don't share a context between conversions of mutable schemas.
+
+    Nested schemas are converted once per :func:`schema_key` into
+    :attr:`definitions`, and referenced with ``$ref``.
+
+    """
+    def __init__(self, index: ConverterIndex, handle_unknown_validator=None):
+        """
+        :param index: :class:`ConverterIndex` to resolve converters.
+        :param handle_unknown_validator: callable that handles validators
+                                         that can not be converted.
+
+        """
+        self.index = index
+        if handle_unknown_validator is not None:
+            self.handle_unknown_validator = handle_unknown_validator
+        # Validators are kept in values to keep their ids valid.
+        self._converters = {}
+        self._required = {}
+        self._plans = {}
+        self._objects = {}
+        #: Converted nested schemas by their names.
+        self.definitions = {}
+        self._definition_names = {}
+        self._root = None
+
+    def handle_unknown_validator(self, validator: Validator):
+        """When context found unknown validator, handle that here."""
+        raise ValueError(
+            "Can not convert a validator {validator!r}"
+            .format(validator=validator))
+
+    def find_converter(self, validator: Validator):
+        """Find converter for ``validator``, or ``None``."""
+        try:
+            return self._converters[id(validator)][1]
+        except KeyError:
+            pass
+        converter = self.index.find(validator, self)
+        self._converters[id(validator)] = (validator, converter)
+        return converter
+
+    def can_convert(self, validator: Validator):
+        return self.find_converter(validator) is not None
+
+    def is_required(self, validator: Validator):
+        try:
+            return self._required[id(validator)][1]
+        except KeyError:
+            pass
+        return self.resolve(validator)[1]
+
+    def resolve(self, validator: Validator):
+        """
+        Get converter and required flag of ``validator`` at once. Converters
+        that can convert ``validator`` are collected only once for both.
+
+        """
+        key = id(validator)
+        try:
+            return self._converters[key][1], self._required[key][1]
+        except KeyError:
+            pass
+        converters = self.index.find_all(validator, self)
+        converter = converters[0] if converters else None
+        required = False
+        for x in converters:
+            if x.is_required(validator, self):
+                required = True
+                break
+        self._converters[key] = (validator, converter)
+        self._required[key] = (validator, required)
+        return converter, required
+
+    def plan_schema(self, schema) -> tuple:
+        """
+        Make ordered :class:`FieldPlan` of fields of formencode ``schema``
+        in a single traversal. Plans are memoized in the context.
+
+        """
+        try:
+            return self._plans[id(schema)][1]
+        except KeyError:
+            pass
+        plan = []
+        for name, validator in schema.fields.items():
+            converter, required = self.resolve(validator)
+            plan.append(FieldPlan(name, validator, converter, required))
+        plan = tuple(plan)
+        self._plans[id(schema)] = (schema, plan)
+        return plan
+
+    def convert_validator(self, validator: Validator):
+        return self.convert_with(self.find_converter(validator), validator)
+
+    def convert_field(self, field: FieldPlan):
+        """Convert validator of planned field."""
+        return self.convert_with(field.converter, field.validator)
+
+    def convert_with(self, converter: ValidatorConverter,
+                     validator: Validator):
+        """Convert ``validator`` with resolved ``converter``."""
+        if converter is None:
+            return self.handle_unknown_validator(validator)
+        return converter.convert(validator, self)
+
+    def convert_object(self, schema: FormencodeSchema) -> dict:
+        """
+        Convert fields of formencode ``schema`` into JSON schema of object.
+        Converted objects are memoized in the context.
+
+        """
+        try:
+            return self._objects[id(schema)][1]
+        except KeyError:
+            pass
+        plan = self.plan_schema(schema)
+        convert_field = self.convert_field
+        document = {
+            'type': 'object',
+            'properties': {x.name: convert_field(x) for x in plan},
+            'required': [x.name for x in plan if x.required],
+        }
+        self._objects[id(schema)] = (schema, document)
+        return document
+
+    def convert_document(self, schema: FormencodeSchema) -> dict:
+        """
+        Convert formencode ``schema`` into JSON schema document with
+        definitions of nested schemas. The first converted document is the
+        root, and references to it are ``#``.
+
+        """
+        self.set_root(schema)
+        document = dict(self.convert_object(schema))
+        if self.definitions:
+            document['definitions'] = dict(self.definitions)
+        return document
+
+    def set_root(self, schema: FormencodeSchema):
+        """Set root schema that is referred as ``#``, unless it is set."""
+        if self._root is None:
+            self._root = schema_key(schema)
+
+    def convert_subschema(self, schema: FormencodeSchema):
+        key = schema_key(schema)
+        if key is self._root:
+            return intern_fragment({'$ref': '#'})
+        try:
+            name = self._definition_names[key]
+        except KeyError:
+            name = self._make_definition_name(key)
+            # Register name first for schemas that refer themselves.
+            self._definition_names[key] = name
+            self.definitions[name] = None
+            self.definitions[name] = self.convert_object(schema)
+        return intern_fragment({'$ref': '#/definitions/' + name})
+
+    def _make_definition_name(self, key):
+        base = key.__name__ if isinstance(key, type) else type(key).__name__
+        name = base
+        suffix = 1
+        while name in self.definitions:
+            suffix += 1
+            name = '{}{}'.format(base, suffix)
+        return name
@@ -0,0 +1,73 @@
+import collections.abc
+import hashlib
+import json
+
+
+class EncodedSchema(object):
+    """
+    Canonical UTF-8 JSON encoding of JSON schema with its strong ETag.
+
+    Keys are sorted and ``required`` lists are ordered, so equal schemas
+    are always encoded into same bytes.
+
+    """
+    __slots__ = ('data', 'etag')
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.etag = '"{}"'.format(hashlib.sha256(data).hexdigest())
+
+    def view(self) -> memoryview:
+        """Get read-only view of encoded bytes without copying."""
+        return memoryview(self.data)
+
+    def not_modified(self, if_none_match: str) -> bool:
+        """
+        Check ``If-None-Match`` header against ETag. Returns ``True`` when
+        ``304 Not Modified`` can be responded.
+
+        """
+        if if_none_match is None:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == self.etag:
+                return True
+        return False
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return '<EncodedSchema {etag} ({size} bytes)>'.format(
+            etag=self.etag, size=len(self.data))
+
+
+def canonicalize(document):
+    """
+    Get copy of ``document`` that ``required`` lists are sorted. Lazy
+    mappings are converted into dicts.
+
+    """
+    if isinstance(document, collections.abc.Mapping):
+        canonical = {}
+        for key, value in document.items():
+            if key == 'required' and isinstance(value, (list, tuple)):
+                canonical[key] = sorted(value)
+            else:
+                canonical[key] = canonicalize(value)
+        return canonical
+    if isinstance(document, (list, tuple)):
+        return [canonicalize(x) for x in document]
+    return document
+
+
+def encode_schema(document: dict) -> EncodedSchema:
+    """Encode JSON schema into canonical UTF-8 JSON bytes."""
+    data = json.dumps(canonicalize(document), sort_keys=True,
+                      separators=(',', ':'), ensure_ascii=False)
+    return EncodedSchema(data.encode('utf-8'))
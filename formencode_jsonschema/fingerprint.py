@@ -0,0 +1,109 @@
+import hashlib
+import json
+import re
+
+from formencode.api import NoDefault
+
+from .converters import (CONVERTERS_VERSION, DEFAULT_CONVERTERS,
+                         RegistryConverter)
+
+
+#: Attributes of validators that converters read.
+FINGERPRINT_ATTRIBUTES = (
+    'not_empty', 'if_missing', 'json_type', 'required', 'description',
+    'min', 'max', 'regex', 'regexOps', 'strip', 'list', 'testValueList',
+)
+
+#: Attributes of validators that hold inner validators.
+NESTED_ATTRIBUTES = ('validator', 'validators', 'fields')
+
+
+def _path(cls) -> str:
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+def _describe_converter(converter):
+    validator_class = converter.validator_class
+    python_type = getattr(converter, 'python_type', None)
+    return [
+        _path(type(converter)),
+        validator_class and _path(validator_class),
+        python_type and _path(python_type),
+        getattr(converter, 'version', None),
+    ]
+
+
+def _describe_registry(registry):
+    # Registered converters are loaded to describe them, so installed or
+    # upgraded plugins change fingerprints.
+    described = []
+    for validator_path, entries in registry.entries.items():
+        for registered in entries:
+            described.append([
+                validator_path,
+                registered.priority,
+                registered.order,
+                registered.distribution,
+                _describe_converter(registered.load()),
+            ])
+    described.sort(key=lambda x: json.dumps(x, sort_keys=True))
+    return described
+
+
+def _describe_converters(converters):
+    described = [CONVERTERS_VERSION]
+    for converter in converters:
+        converter_described = _describe_converter(converter)
+        if isinstance(converter, RegistryConverter):
+            converter_described.append(
+                _describe_registry(converter.registry))
+        described.append(converter_described)
+    return described
+
+
+def _describe(value, seen):
+    if value is NoDefault:
+        return ['NoDefault']
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _describe(v, seen) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(x, seen) for x in value]
+    if isinstance(value, (set, frozenset)):
+        described = [_describe(x, seen) for x in value]
+        return ['set', sorted(described, key=lambda x: json.dumps(
+            x, sort_keys=True))]
+    if isinstance(value, re.Pattern):
+        return ['pattern', value.pattern, value.flags]
+    if not hasattr(value, 'to_python'):
+        return ['object', _path(type(value))]
+    # Validators, or classes of them.
+    if id(value) in seen:
+        return ['ref', seen[id(value)][0]]
+    seen[id(value)] = (len(seen), value)
+    cls = value if isinstance(value, type) else type(value)
+    described = {'class': _path(cls)}
+    for name in FINGERPRINT_ATTRIBUTES + NESTED_ATTRIBUTES:
+        attribute = getattr(value, name, None)
+        if attribute is not None:
+            described[name] = _describe(attribute, seen)
+    return ['validator', described]
+
+
+def schema_fingerprint(schema, converters=DEFAULT_CONVERTERS) -> str:
+    """
+    Get stable fingerprint of formencode schema (or class) and converters.
+    It changes when names of fields, classes of validators or attributes
+    that converters read are changed. ::
+
+        >>> schema_fingerprint(UserCreate)
+        '0f4b9c...'
+
+    """
+    described = {
+        'converters': _describe_converters(converters),
+        'schema': _describe(schema, {}),
+    }
+    data = json.dumps(described, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
@@ -0,0 +1,131 @@
+import collections.abc
+
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (DEFAULT_CONVERTERS, ConversionContext,
+                         get_converter_index)
+
+
+class LazyProperties(collections.abc.Mapping):
+    """
+    ``properties`` of JSON schema that converts each field on first access.
+    Iterating names doesn't convert fields.
+
+    """
+    def __init__(self, schema: FormencodeSchema, context: ConversionContext):
+        self._fields = schema.fields
+        self._context = context
+        self._converted = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._converted[name]
+        except KeyError:
+            pass
+        validator = self._fields[name]
+        converted = self._context.convert_validator(validator)
+        return self._converted.setdefault(name, converted)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def is_converted(self, name) -> bool:
+        """Check that field is already converted."""
+        return name in self._converted
+
+    def materialize(self) -> dict:
+        """Convert all fields into a dict."""
+        return {name: self[name] for name in self._fields}
+
+
+class LazySchemaDocument(collections.abc.Mapping):
+    """
+    JSON schema document that converts formencode schema on demand.
+    ``properties`` is :class:`LazyProperties`, and ``required`` is collected
+    on first access. Iterating keys converts all fields, because
+    ``definitions`` of nested schemas are known only after that.
+
+    Use :meth:`materialize` or :func:`~.encoding.encode_schema` to
+    serialize it.
+
+    """
+    def __init__(self, schema: FormencodeSchema, context: ConversionContext):
+        self._schema = schema
+        self._context = context
+        self._required = None
+        self.properties = LazyProperties(schema, context)
+
+    @property
+    def required(self) -> list:
+        if self._required is None:
+            is_required = self._context.is_required
+            fields = self._schema.fields
+            self._required = [x for x in fields if is_required(fields[x])]
+        return self._required
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return 'object'
+        if key == 'properties':
+            return self.properties
+        if key == 'required':
+            return self.required
+        if key == 'definitions':
+            self.properties.materialize()
+            if self._context.definitions:
+                return self._context.definitions
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'type'
+        yield 'properties'
+        yield 'required'
+        self.properties.materialize()
+        if self._context.definitions:
+            yield 'definitions'
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def materialize(self) -> dict:
+        """Convert whole document into a dict."""
+        document = {
+            'type': 'object',
+            'properties': self.properties.materialize(),
+            'required': list(self.required),
+        }
+        if self._context.definitions:
+            document['definitions'] = dict(self._context.definitions)
+        return document
+
+
+def lazy_schema(schema: FormencodeSchema, converters=DEFAULT_CONVERTERS,
+                context: ConversionContext=None) -> LazySchemaDocument:
+    """
+    Like :func:`~.compiler.compile_schema`, but converts fields on demand.
+    ::
+
+        >>> document = lazy_schema(HugeAdminForm)
+        >>> document['properties']['email']  # converts only this field
+        {'type': 'string'}
+
+    """
+    if context is None:
+        context = ConversionContext(get_converter_index(converters))
+    context.set_root(schema)
+    return LazySchemaDocument(schema, context)
+
+
+def materialize(value):
+    """
+    Convert lazy documents into dicts. It can be used as ``default`` of
+    :func:`json.dumps`.
+
+    """
+    if isinstance(value, (LazySchemaDocument, LazyProperties)):
+        return value.materialize()
+    raise TypeError('Object of type {} is not JSON serializable'
+                    .format(type(value).__name__))
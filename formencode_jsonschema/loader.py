@@ -0,0 +1,151 @@
+"""
+Loader of JSON schema bundles, built by ``python -m formencode_jsonschema
+build``. This module imports neither formencode nor marshmallow.
+"""
+import json
+import mmap
+import struct
+
+
+#: Format name and version of bundle files.
+BUNDLE_FORMAT = 'formencode_jsonschema.bundle'
+BUNDLE_VERSION = 1
+
+#: Header of binary bundles: magic, version and size of index.
+BINARY_HEADER = struct.Struct('<4sII')
+BINARY_MAGIC = b'FJSB'
+BINARY_VERSION = 1
+
+
+class SchemaBundle(object):
+    """
+    Converted JSON schemas, keyed by ``module.ClassName`` of formencode
+    schemas. ::
+
+        bundle = SchemaBundle.load('schemas.json')
+        bundle['myproject.schemas.UserCreate']
+
+    """
+    def __init__(self, schemas: dict):
+        self.schemas = schemas
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        if data.get('format') != BUNDLE_FORMAT:
+            raise ValueError("Not a schema bundle")
+        if data.get('version') != BUNDLE_VERSION:
+            raise ValueError(
+                "Unsupported bundle version {version!r}"
+                .format(version=data.get('version')))
+        return cls(data['schemas'])
+
+    @classmethod
+    def load(cls, path):
+        """Load bundle file."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def names(self):
+        """Get sorted names of schemas."""
+        return sorted(self.schemas)
+
+    def get(self, name, default=None):
+        return self.schemas.get(name, default)
+
+    def __getitem__(self, name):
+        return self.schemas[name]
+
+    def __contains__(self, name):
+        return name in self.schemas
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.schemas)
+
+
+class MappedBundle(object):
+    """
+    Binary bundle of JSON schemas, memory-mapped from file. Pre-forked
+    workers that open the same file share its pages in the page cache.
+
+    Binary bundles consist of a header, a JSON index that maps names to
+    ``[offset, length, etag]`` and canonical JSON bytes of schemas. ::
+
+        bundle = MappedBundle('schemas.bin')
+        bundle.raw('myproject.schemas.UserCreate')  # memoryview, no copy
+        bundle['myproject.schemas.UserCreate']      # decoded on demand
+
+    Views returned by :meth:`raw` must be released before :meth:`close`.
+
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, index_size = \
+                BINARY_HEADER.unpack_from(self._mmap, 0)
+            if magic != BINARY_MAGIC:
+                raise ValueError("Not a binary schema bundle")
+            if version != BINARY_VERSION:
+                raise ValueError(
+                    "Unsupported bundle version {version!r}"
+                    .format(version=version))
+            start = BINARY_HEADER.size
+            self._index = json.loads(
+                self._mmap[start:start + index_size].decode('utf-8'))
+        except Exception:
+            self._mmap.close()
+            raise
+        self._data_offset = start + index_size
+        self._view = memoryview(self._mmap)
+        self._decoded = {}
+
+    def names(self):
+        """Get sorted names of schemas."""
+        return sorted(self._index)
+
+    def raw(self, name) -> memoryview:
+        """Get encoded JSON bytes of schema without copying."""
+        offset, length, _ = self._index[name]
+        offset += self._data_offset
+        return self._view[offset:offset + length]
+
+    def etag(self, name) -> str:
+        """Get strong ETag of encoded schema."""
+        return self._index[name][2]
+
+    def get(self, name, default=None):
+        if name not in self._index:
+            return default
+        return self[name]
+
+    def __getitem__(self, name):
+        try:
+            return self._decoded[name]
+        except KeyError:
+            pass
+        with self.raw(name) as view:
+            document = json.loads(str(view, 'utf-8'))
+        return self._decoded.setdefault(name, document)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Unmap bundle file."""
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
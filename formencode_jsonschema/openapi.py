@@ -0,0 +1,121 @@
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (DEFAULT_CONVERTERS, ConversionContext,
+                         get_converter_index, schema_key)
+from .encoding import encode_schema
+from .utils import intern_fragment
+
+
+class ComponentsContext(ConversionContext):
+    """
+    :class:`~.converters.ConversionContext` that converts every schema,
+    including top level ones, into :attr:`definitions` referenced as OpenAPI
+    components. Structurally identical schemas share a definition.
+
+    """
+    #: Prefix of references to definitions.
+    ref_prefix = '#/components/schemas/'
+
+    def __init__(self, index, handle_unknown_validator=None):
+        super().__init__(index, handle_unknown_validator)
+        # Names of definitions by digests of their canonical encodings.
+        self._digests = {}
+        # Names of definitions being converted, and whether they are
+        # referred while converted.
+        self._pending = {}
+
+    def convert_subschema(self, schema: FormencodeSchema):
+        return self.convert_component(schema)
+
+    def convert_component(self, schema: FormencodeSchema, name=None):
+        """
+        Convert ``schema`` into a definition, once per
+        :func:`~.converters.schema_key`, and get reference to it.
+
+        :param name: name of new definition. Class name of ``schema`` is
+                     used if it is not given.
+
+        """
+        key = schema_key(schema)
+        try:
+            name = self._definition_names[key]
+        except KeyError:
+            name = self._add_definition(key, schema, name)
+        else:
+            if name in self._pending:
+                self._pending[name] = True
+        return intern_fragment({'$ref': self.ref_prefix + name})
+
+    def _add_definition(self, key, schema, name):
+        if name is None or name in self.definitions:
+            name = self._make_definition_name(key)
+        # Register name first for schemas that refer themselves.
+        self._definition_names[key] = name
+        self.definitions[name] = None
+        self._pending[name] = False
+        try:
+            document = self.convert_object(schema)
+        finally:
+            referred = self._pending.pop(name)
+        digest = encode_schema(document).etag
+        shared = self._digests.get(digest)
+        # References to a recursive schema are already made with its name.
+        if shared is not None and not referred:
+            del self.definitions[name]
+            self._definition_names[key] = shared
+            return shared
+        self.definitions[name] = document
+        self._digests.setdefault(digest, name)
+        return name
+
+
+class ComponentsBuilder(object):
+    """
+    Builder of OpenAPI ``components/schemas`` from many formencode schemas.
+    Each schema class is converted once, and structurally identical
+    schemas are collapsed into a shared component. Schemas can be added
+    incrementally. ::
+
+        builder = ComponentsBuilder()
+        for endpoint in endpoints:
+            operation['requestBody'] = {'content': {'application/json': {
+                'schema': builder.add(endpoint.schema),
+            }}}
+        document = builder.build({'openapi': '3.0.3', 'paths': paths})
+
+    """
+    def __init__(self, converters=DEFAULT_CONVERTERS,
+                 handle_unknown_validator=None):
+        self.context = ComponentsContext(get_converter_index(converters),
+                                         handle_unknown_validator)
+
+    @property
+    def schemas(self) -> dict:
+        """Converted components by their names."""
+        return self.context.definitions
+
+    def add(self, schema: FormencodeSchema, name=None) -> dict:
+        """
+        Add formencode ``schema`` (or its class) and get ``$ref`` to its
+        component. Schemas that were already added aren't converted again.
+
+        """
+        return self.context.convert_component(schema, name)
+
+    def add_many(self, schemas) -> list:
+        """Add formencode schemas and get ``$ref`` to their components."""
+        return [self.add(x) for x in schemas]
+
+    def build(self, document: dict=None) -> dict:
+        """
+        Get copy of OpenAPI ``document`` with the components. Other
+        components of ``document`` are kept.
+
+        """
+        document = dict(document or {})
+        components = dict(document.get('components', {}))
+        schemas = dict(components.get('schemas', {}))
+        schemas.update(self.schemas)
+        components['schemas'] = schemas
+        document['components'] = components
+        return document
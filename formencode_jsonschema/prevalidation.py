@@ -0,0 +1,551 @@
+import collections
+import concurrent.futures
+import datetime
+import math
+import re
+import uuid
+
+from formencode.api import FancyValidator, Invalid, NoDefault, is_empty
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (DEFAULT_CONVERTERS, ConversionContext,
+                         ForEachValidatorConverter, OneOfValidatorConverter,
+                         LengthValidatorConverter, RangeValidatorConverter,
+                         RegexValidatorConverter, SchemaValidatorConverter,
+                         SimpleValidatorConverter, get_converter_index)
+
+
+def _parses(parse):
+    def check(value):
+        try:
+            parse(value)
+        except (ValueError, TypeError, OverflowError):
+            return False
+        return True
+    return check
+
+
+def _is_any(value):
+    return True
+
+
+def _is_object(value):
+    # Formencode schemas take falsy values as empty dicts.
+    return isinstance(value, dict) or not value
+
+
+def _is_null(value):
+    return value is None
+
+
+#: Checks of types, as lenient as formencode validators that convert
+#: values, e.g. ``Int`` takes ``'42'`` and ``UnicodeString`` takes anything.
+TYPE_CHECKS = {
+    'string': _is_any,
+    'integer': _parses(int),
+    'number': _parses(float),
+    'boolean': _is_any,
+    'array': _is_any,
+    'object': _is_object,
+    'null': _is_null,
+}
+
+
+def _parse_date_time(value):
+    # ``fromisoformat`` of older Pythons doesn't accept ``Z``.
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    return datetime.datetime.fromisoformat(value)
+
+
+#: Checks of string formats. Other formats are annotations.
+FORMAT_CHECKS = {
+    'date': _parses(datetime.date.fromisoformat),
+    'date-time': _parses(_parse_date_time),
+    'time': _parses(datetime.time.fromisoformat),
+    'uuid': _parses(uuid.UUID),
+}
+
+
+#: Converted values and errors of valid and invalid records, by indices of
+#: records. Errors are messages by paths, as :meth:`PreValidator.validate`.
+ValidationResult = collections.namedtuple('ValidationResult',
+                                          ['values', 'errors'])
+
+
+class _Compiler(object):
+    """Compiles nodes of a JSON schema document into checker closures."""
+    def __init__(self, document: dict):
+        self.document = document
+        # Cells of checkers by ``$ref``, filled after compiling targets so
+        # recursive references are resolved when they are called.
+        self._refs = {}
+
+    def compile(self):
+        return self.compile_node(self.document)
+
+    def compile_ref(self, ref):
+        try:
+            cell = self._refs[ref]
+        except KeyError:
+            cell = self._refs[ref] = []
+            cell.append(self.compile_node(self.resolve(ref)))
+
+        def check_ref(value, path, errors):
+            return cell[0](value, path, errors)
+        return check_ref
+
+    def resolve(self, ref):
+        if ref == '#':
+            return self.document
+        prefix = '#/definitions/'
+        if not ref.startswith(prefix):
+            raise ValueError("Can not resolve a reference {!r}".format(ref))
+        return self.document['definitions'][ref[len(prefix):]]
+
+    def compile_node(self, node: dict):
+        if '$ref' in node:
+            return self.compile_ref(node['$ref'])
+        checks = []
+        json_type = node.get('type')
+        if json_type is not None:
+            checks.append(self.compile_type(json_type))
+        if 'enum' in node:
+            checks.append(self.compile_enum(node['enum']))
+        if json_type == 'object' or 'properties' in node:
+            checks.extend(self.compile_object(node))
+        if json_type == 'array' or 'items' in node:
+            checks.extend(self.compile_array(node))
+        checks.extend(self.compile_string(node))
+        checks.extend(self.compile_number(node))
+        return self.combine(checks)
+
+    def checks_empty(self, node: dict) -> bool:
+        """Whether empty values are checked by ``node``, like objects."""
+        while '$ref' in node:
+            node = self.resolve(node['$ref'])
+        return node.get('type') == 'object'
+
+    def combine(self, checks):
+        if not checks:
+            def check_any(value, path, errors):
+                return True
+            return check_any
+        if len(checks) == 1:
+            return checks[0]
+        checks = tuple(checks)
+
+        def check_all(value, path, errors):
+            # Stop at the first failure, e.g. lengths of non-strings.
+            for check in checks:
+                if not check(value, path, errors):
+                    return False
+            return True
+        return check_all
+
+    def compile_type(self, json_type):
+        if isinstance(json_type, str):
+            is_type = TYPE_CHECKS[json_type]
+            message = 'Expected {}'.format(json_type)
+        else:
+            type_checks = tuple(TYPE_CHECKS[x] for x in json_type)
+
+            def is_type(value):
+                return any(x(value) for x in type_checks)
+            message = 'Expected {}'.format(' or '.join(json_type))
+
+        def check_type(value, path, errors):
+            if is_type(value):
+                return True
+            errors.setdefault(path, message)
+            return False
+        return check_type
+
+    def compile_enum(self, values):
+        try:
+            choices = frozenset(values)
+        except TypeError:
+            choices = tuple(values)
+        message = 'Value must be one of: {}'.format(
+            '; '.join(str(x) for x in values))
+
+        def check_enum(value, path, errors):
+            try:
+                if value in choices:
+                    return True
+            except TypeError:
+                pass
+            errors.setdefault(path, message)
+            return False
+        return check_enum
+
+    def compile_object(self, node):
+        required = frozenset(node.get('required', ()))
+        properties = tuple(
+            (name, '.' + name, name in required, self.checks_empty(x),
+             self.compile_node(x))
+            for name, x in node.get('properties', {}).items())
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                if value:
+                    return True
+                value = {}
+            valid = True
+            for name, suffix, is_required, checks_empty, check in properties:
+                try:
+                    item = value[name]
+                except KeyError:
+                    if is_required:
+                        errors.setdefault(path + suffix if path else name,
+                                          'Missing value')
+                        valid = False
+                    continue
+                # Validators of fields decide on empty values.
+                if not checks_empty and is_empty(item):
+                    continue
+                if not check(item, path + suffix if path else name, errors):
+                    valid = False
+            return valid
+        yield check_object
+
+    def compile_array(self, node):
+        if 'items' in node:
+            check_item = self.compile_node(node['items'])
+            checks_empty = self.checks_empty(node['items'])
+
+            def check_items(value, path, errors):
+                if not isinstance(value, (list, tuple)):
+                    return True
+                valid = True
+                for i, item in enumerate(value):
+                    if not checks_empty and is_empty(item):
+                        continue
+                    if not check_item(item, '{}-{}'.format(path, i)
+                                      if path else str(i), errors):
+                        valid = False
+                return valid
+            yield check_items
+        yield from self.compile_bounds(node, 'minItems', 'maxItems', len,
+                                       (list, tuple), 'items')
+
+    def compile_string(self, node):
+        yield from self.compile_bounds(node, 'minLength', 'maxLength', len,
+                                       str, 'characters')
+        pattern = node.get('pattern')
+        if isinstance(pattern, str):
+            try:
+                pattern = re.compile(pattern)
+            except re.error:
+                # ECMA 262 only syntax, e.g. ``(?<name>...)``, can not be
+                # checked.
+                pattern = None
+        if pattern is not None:
+            search = pattern.search
+            message = 'The input is not valid'
+
+            def check_pattern(value, path, errors):
+                if not isinstance(value, str):
+                    errors.setdefault(path, 'The input must be a string')
+                    return False
+                if search(value):
+                    return True
+                errors.setdefault(path, message)
+                return False
+            yield check_pattern
+        is_format = FORMAT_CHECKS.get(node.get('format'))
+        if is_format is not None:
+            message = 'Expected {} format'.format(node['format'])
+
+            def check_format(value, path, errors):
+                if not isinstance(value, str) or is_format(value):
+                    return True
+                errors.setdefault(path, message)
+                return False
+            yield check_format
+
+    def compile_number(self, node):
+        def measure(value):
+            return value
+        yield from self.compile_bounds(node, 'minimum', 'maximum', measure,
+                                       (int, float), None)
+
+    def compile_bounds(self, node, min_key, max_key, measure, types, unit):
+        minimum = node.get(min_key)
+        maximum = node.get(max_key)
+        if minimum is None and maximum is None:
+            return
+        suffix = ' {}'.format(unit) if unit else ''
+        too_small = 'Must be at least {}{}'.format(minimum, suffix)
+        too_large = 'Must be at most {}{}'.format(maximum, suffix)
+
+        def check_bounds(value, path, errors):
+            if not isinstance(value, types) or isinstance(value, bool):
+                return True
+            size = measure(value)
+            if minimum is not None and size < minimum:
+                errors.setdefault(path, too_small)
+                return False
+            if maximum is not None and size > maximum:
+                errors.setdefault(path, too_large)
+                return False
+            return True
+        yield check_bounds
+
+
+#: Converters whose output describes what validators reject. Others, e.g.
+#: of compound validators that transform values before checking them, or
+#: of typed validators, are not checked.
+CHECKED_CONVERTERS = (
+    SimpleValidatorConverter,
+    LengthValidatorConverter,
+    RangeValidatorConverter,
+    RegexValidatorConverter,
+    OneOfValidatorConverter,
+    ForEachValidatorConverter,
+    SchemaValidatorConverter,
+)
+
+
+def _compile_regex(validator):
+    regex = validator.regex
+    if not isinstance(regex, str):
+        return regex
+    # Validator classes have patterns that are compiled on instantiation.
+    flags = 0
+    for op in validator.regexOps:
+        flags |= getattr(re, op) if isinstance(op, str) else op
+    return re.compile(regex, flags)
+
+
+def _must_be_present(schema: FormencodeSchema, validator) -> bool:
+    return (not schema.ignore_key_missing and
+            schema.if_key_missing is NoDefault and
+            getattr(validator, 'if_missing', NoDefault) is NoDefault)
+
+
+class PrevalidationContext(ConversionContext):
+    """
+    :class:`~.converters.ConversionContext` that converts formencode schemas
+    into documents of :class:`PreValidator`. Unlike JSON schema, required
+    properties are keys that formencode reports missing, and only output of
+    :data:`CHECKED_CONVERTERS` is kept.
+
+    """
+    def handle_unknown_validator(self, validator):
+        return {}
+
+    def convert_with(self, converter, validator):
+        if type(converter) not in CHECKED_CONVERTERS or \
+                getattr(validator, 'if_invalid', NoDefault) is not NoDefault:
+            return {}
+        converted = super().convert_with(converter, validator)
+        if isinstance(converter, RegexValidatorConverter) and \
+                not getattr(validator, 'strip', False):
+            # ``pattern`` is translated into ECMA 262, so values are checked
+            # by the compiled regex of the validator instead.
+            converted = dict(converted, pattern=_compile_regex(validator))
+        return converted
+
+    def convert_object(self, schema: FormencodeSchema) -> dict:
+        # Pre validators may turn anything into valid values, and
+        # ``if_empty`` is taken for empty values.
+        if schema.pre_validators or schema.if_empty is not NoDefault:
+            return {}
+        document = dict(super().convert_object(schema))
+        document['required'] = [
+            name for name, validator in schema.fields.items()
+            if _must_be_present(schema, validator)
+        ]
+        return document
+
+
+class PreValidator(object):
+    """
+    Structural validator of payloads, compiled from JSON schema document.
+
+    Keywords of the document are compiled once into closures, so payloads
+    are checked without interpreting the document. It checks ``type``,
+    ``properties``, ``required``, ``items``, ``enum``, ``format`` of strings,
+    and lengths, bounds and patterns. Other keywords are ignored. ::
+
+        prevalidator = PreValidator.from_schema(UserCreate)
+        errors = prevalidator.validate(payload)
+
+    Payloads are decoded JSON. It rejects only what formencode would
+    reject, so types are as lenient as formencode validators, e.g.
+    ``'42'`` is an integer. Empty values like ``None`` are left to
+    validators, and ``required`` properties must be present.
+
+    """
+    def __init__(self, document: dict):
+        self.document = document
+        self._check = _Compiler(document).compile()
+
+    @classmethod
+    def from_schema(cls, schema: FormencodeSchema, json_schema=None):
+        """
+        Compile formencode ``schema`` with converters of ``json_schema``, or
+        with default converters if it is not given. The document is
+        converted by :class:`PrevalidationContext`.
+
+        """
+        if json_schema is None:
+            index = get_converter_index(DEFAULT_CONVERTERS)
+        else:
+            index = json_schema.converter_index
+        return cls(PrevalidationContext(index).convert_document(schema))
+
+    def validate(self, value) -> dict:
+        """
+        Get error messages by paths of invalid values. Paths are encoded
+        like :func:`formencode.variabledecode.variable_encode`, e.g.
+        ``offices-0.street``. Empty path is the payload itself.
+
+        """
+        errors = {}
+        self._check(value, '', errors)
+        return errors
+
+    def is_valid(self, value) -> bool:
+        """Check that ``value`` passes without collecting all errors."""
+        return self._check(value, '', {})
+
+    def __reduce__(self):
+        # Closures are compiled again when sent to other processes.
+        return type(self), (self.document,)
+
+
+def _unpack_invalid(error: Invalid) -> dict:
+    if error.error_dict:
+        return error.unpack_errors(encode_variables=True)
+    return {'': error.msg}
+
+
+def _validate_chunk(schema, prevalidator, start, records):
+    values = {}
+    errors = {}
+    passed = []
+    validate = prevalidator.validate
+    # Structural checks of whole chunk come first, so ``to_python`` is
+    # reached only by records that pass.
+    for i, record in enumerate(records, start):
+        found = validate(record)
+        if found:
+            errors[i] = found
+        else:
+            passed.append((i, record))
+    to_python = schema.to_python
+    for i, record in passed:
+        try:
+            values[i] = to_python(record)
+        except Invalid as e:
+            errors[i] = _unpack_invalid(e)
+    return values, errors
+
+
+def validate_many(schema: FormencodeSchema, records, workers=None,
+                  chunksize=None, processes=False,
+                  prevalidator: PreValidator=None) -> ValidationResult:
+    """
+    Validate many records against formencode ``schema``. Records are
+    checked in chunks by a shared :class:`PreValidator`, and only records
+    that pass are converted by ``schema``. ::
+
+        values, errors = validate_many(UserCreate(), records, workers=4)
+        for index, messages in errors.items():
+            ...
+
+    :param workers: number of threads, or processes with ``processes``.
+                    Chunks are validated in the current thread unless it
+                    is more than 1.
+    :param chunksize: number of records validated at once.
+    :param processes: use a process pool. ``schema`` and records should be
+                      picklable.
+    :param prevalidator: :class:`PreValidator` of ``schema``, compiled if it
+                         is not given.
+
+    """
+    if prevalidator is None:
+        prevalidator = PreValidator.from_schema(schema)
+    records = list(records)
+    parallel = workers is not None and workers > 1 and len(records) > 1
+    if chunksize is None:
+        if parallel:
+            chunksize = max(1, math.ceil(len(records) / workers / 4))
+        else:
+            chunksize = 1000
+    starts = range(0, len(records), chunksize)
+    chunks = [records[i:i + chunksize] for i in starts]
+    count = len(chunks)
+    if not parallel:
+        results = map(_validate_chunk, [schema] * count,
+                      [prevalidator] * count, starts, chunks)
+        return _merge_results(results)
+    if processes:
+        pool = concurrent.futures.ProcessPoolExecutor(workers)
+    else:
+        pool = concurrent.futures.ThreadPoolExecutor(workers)
+    with pool:
+        results = pool.map(_validate_chunk, [schema] * count,
+                           [prevalidator] * count, starts, chunks)
+        return _merge_results(results)
+
+
+def _merge_results(results) -> ValidationResult:
+    values = {}
+    errors = {}
+    for chunk_values, chunk_errors in results:
+        values.update(chunk_values)
+        errors.update(chunk_errors)
+    return ValidationResult(values, errors)
+
+
+class PreValidated(FancyValidator):
+    """
+    Formencode validator that rejects payloads with :class:`PreValidator`
+    before ``schema`` converts them. ::
+
+        validator = PreValidated(UserCreate())
+        validator.to_python(payload)
+
+    """
+    __unpackargs__ = ('schema',)
+
+    #: :class:`~.schema.JSONSchema` used to convert ``schema``.
+    json_schema = None
+
+    messages = {
+        'invalid': 'The input is not valid',
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prevalidator = PreValidator.from_schema(self.schema,
+                                                     self.json_schema)
+
+    def is_empty(self, value):
+        # ``schema`` decides on empty payloads, e.g. of required fields.
+        return False
+
+    def validate_many(self, records, **kwargs) -> ValidationResult:
+        """
+        Validate many records with :func:`validate_many`, sharing
+        compiled :attr:`prevalidator`.
+
+        """
+        return validate_many(self.schema, records,
+                             prevalidator=self.prevalidator, **kwargs)
+
+    def _convert_to_python(self, value, state=None):
+        errors = self.prevalidator.validate(value)
+        if errors:
+            error = errors.pop('', None)
+            if error is not None:
+                raise Invalid(error, value, state)
+            raise Invalid(self.message('invalid', state), value, state,
+                          error_dict=errors)
+        return self.schema.to_python(value, state)
+
+    def _convert_from_python(self, value, state=None):
+        return self.schema.from_python(value, state)
@@ -0,0 +1,197 @@
+import collections
+import time
+
+from formencode.api import Validator
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (ConversionContext, ConverterIndex, FieldPlan,
+                         SchemaDelegate, ValidatorConverter, validator_class)
+
+
+#: Conversion time and recursion depth of a field.
+FieldStats = collections.namedtuple('FieldStats',
+                                    ['schema', 'name', 'time', 'depth'])
+
+
+class ConverterStats(object):
+    """Counters and timings of a converter class."""
+    __slots__ = ('can_convert_calls', 'can_convert_hits', 'convert_calls',
+                 'convert_time', 'is_required_calls', 'is_required_time')
+
+    def __init__(self):
+        self.can_convert_calls = 0
+        self.can_convert_hits = 0
+        self.convert_calls = 0
+        self.convert_time = 0.0
+        self.is_required_calls = 0
+        self.is_required_time = 0.0
+
+    def __repr__(self):
+        return ('<ConverterStats can_convert={0.can_convert_hits}/'
+                '{0.can_convert_calls} convert={0.convert_calls} '
+                '({0.convert_time:.6f}s) is_required={0.is_required_calls} '
+                '({0.is_required_time:.6f}s)>'.format(self))
+
+
+class ConversionStats(object):
+    """
+    Statistics of conversions, collected by :class:`ProfilingContext`. ::
+
+        stats = ConversionStats()
+        JSONSchema(stats=stats).dump(SomeSchema())
+        print(stats.report())
+
+    Times of nested conversions are included in times of outer converters.
+    Counters are not synchronized, so don't share it between threads.
+
+    """
+    def __init__(self, callback=None):
+        """
+        :param callback: called with :class:`FieldStats` whenever a field is
+                         converted.
+
+        """
+        self.callback = callback
+        #: :class:`ConverterStats` by converter class.
+        self.converters = collections.defaultdict(ConverterStats)
+        #: :class:`FieldStats` of converted fields.
+        self.fields = []
+        self.max_depth = 0
+
+    def reset(self):
+        """Reset collected statistics."""
+        self.converters.clear()
+        del self.fields[:]
+        self.max_depth = 0
+
+    def slowest_fields(self, count=10):
+        """Get ``count`` fields that took the longest time."""
+        return sorted(self.fields, key=lambda x: x.time,
+                      reverse=True)[:count]
+
+    def report(self) -> str:
+        """Format statistics as a table."""
+        lines = ['{:<32} {:>9} {:>9} {:>9} {:>12} {:>9} {:>12}'.format(
+            'converter', 'checked', 'hits', 'converts', 'convert time',
+            'required', 'req. time')]
+        for cls, x in sorted(self.converters.items(),
+                             key=lambda x: x[1].convert_time, reverse=True):
+            lines.append(
+                '{:<32} {:>9} {:>9} {:>9} {:>12.6f} {:>9} {:>12.6f}'.format(
+                    cls.__name__, x.can_convert_calls, x.can_convert_hits,
+                    x.convert_calls, x.convert_time, x.is_required_calls,
+                    x.is_required_time))
+        lines.append('max depth: {}'.format(self.max_depth))
+        return '\n'.join(lines)
+
+
+class _ProfiledConverter(ValidatorConverter):
+    """Proxy of converter that records statistics."""
+    def __init__(self, converter: ValidatorConverter, context):
+        self.converter = converter
+        self.validator_class = converter.validator_class
+        self.context = context
+        self.stats = context.stats.converters[type(converter)]
+
+    def match_class(self, validator_class):
+        return self.converter.match_class(validator_class)
+
+    def can_convert(self, validator: Validator, delegate: SchemaDelegate):
+        self.stats.can_convert_calls += 1
+        result = self.converter.can_convert(validator, delegate)
+        if result:
+            self.stats.can_convert_hits += 1
+        return result
+
+    def convert(self, validator: Validator, delegate: SchemaDelegate):
+        context = self.context
+        context.depth += 1
+        context.field_depth = max(context.field_depth, context.depth)
+        start = time.perf_counter()
+        try:
+            return self.converter.convert(validator, delegate)
+        finally:
+            self.stats.convert_time += time.perf_counter() - start
+            self.stats.convert_calls += 1
+            context.depth -= 1
+
+    def is_required(self, validator: Validator, delegate: SchemaDelegate):
+        start = time.perf_counter()
+        try:
+            return self.converter.is_required(validator, delegate)
+        finally:
+            self.stats.is_required_time += time.perf_counter() - start
+            self.stats.is_required_calls += 1
+
+
+class _ProfilingIndex(ConverterIndex):
+    """
+    Index of :class:`_ProfiledConverter` that counts exact matches as checks
+    and hits, though :meth:`~ValidatorConverter.can_convert` isn't called.
+
+    """
+    def find(self, validator: Validator, delegate: SchemaDelegate):
+        for converter, exact in self.candidates(validator_class(validator)):
+            if exact:
+                converter.stats.can_convert_calls += 1
+                converter.stats.can_convert_hits += 1
+                return converter
+            if converter.can_convert(validator, delegate):
+                return converter
+        return None
+
+    def find_all(self, validator: Validator, delegate: SchemaDelegate):
+        found = []
+        for converter, exact in self.candidates(validator_class(validator)):
+            if exact:
+                converter.stats.can_convert_calls += 1
+                converter.stats.can_convert_hits += 1
+                found.append(converter)
+            elif converter.can_convert(validator, delegate):
+                found.append(converter)
+        return found
+
+
+class ProfilingContext(ConversionContext):
+    """
+    :class:`~.converters.ConversionContext` that records statistics into
+    :class:`ConversionStats`. Use it only while profiling, because it
+    classifies validator classes again for each conversion.
+
+    """
+    def __init__(self, index: ConverterIndex, handle_unknown_validator=None,
+                 stats: ConversionStats=None):
+        self.stats = stats if stats is not None else ConversionStats()
+        self.depth = 0
+        self.field_depth = 0
+        self._schemas = []
+        index = _ProfilingIndex(_ProfiledConverter(x, self)
+                                for x in index.converters)
+        super().__init__(index, handle_unknown_validator)
+
+    def convert_object(self, schema: FormencodeSchema) -> dict:
+        self._schemas.append(schema)
+        try:
+            return super().convert_object(schema)
+        finally:
+            self._schemas.pop()
+
+    def convert_field(self, field: FieldPlan):
+        schema = self._schemas[-1]
+        if not isinstance(schema, type):
+            schema = type(schema)
+        outer_depth = self.field_depth
+        self.field_depth = self.depth
+        start = time.perf_counter()
+        try:
+            return super().convert_field(field)
+        finally:
+            elapsed = time.perf_counter() - start
+            depth = self.field_depth - self.depth
+            self.field_depth = max(outer_depth, self.field_depth)
+            self.stats.max_depth = max(self.stats.max_depth, depth)
+            field_stats = FieldStats(schema.__name__, field.name, elapsed,
+                                     depth)
+            self.stats.fields.append(field_stats)
+            if self.stats.callback is not None:
+                self.stats.callback(field_stats)
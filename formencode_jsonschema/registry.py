@@ -0,0 +1,205 @@
+import importlib
+import threading
+
+# ``RegistryConverter`` lives in converters, which this module can't be
+# imported by, and is kept here for plugins.
+from .converters import RegistryConverter, ValidatorConverter  # noqa: F401
+
+
+#: Entry point group of converter plugins.
+ENTRY_POINT_GROUP = 'formencode_jsonschema.converters'
+
+
+def _iter_entry_points(group):
+    try:
+        from importlib import metadata
+    except ImportError:  # pragma: no cover
+        import pkg_resources
+        return pkg_resources.iter_entry_points(group)
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    return entry_points.get(group, ())
+
+
+# Converters are imported under the lock, so each is loaded only once even
+# when threads race. Imports of converters may load others.
+_load_lock = threading.RLock()
+
+
+def _distribution(entry_point):
+    # Entry points of ``importlib.metadata`` know their distributions since
+    # Python 3.10, and those of ``pkg_resources`` always do.
+    dist = getattr(entry_point, 'dist', None)
+    if dist is None:
+        return None
+    name = getattr(dist, 'name', None) or getattr(dist, 'project_name', None)
+    if name is None:
+        name = dist.metadata['Name']
+    return '{}=={}'.format(name, dist.version)
+
+
+def _import_string(path):
+    module_name, _, attribute = path.partition(':')
+    obj = importlib.import_module(module_name)
+    for name in attribute.split('.') if attribute else ():
+        obj = getattr(obj, name)
+    return obj
+
+
+def class_path(cls) -> str:
+    """Get path of class that keys the registry, ``module.ClassName``."""
+    return '{}.{}'.format(cls.__module__, cls.__qualname__)
+
+
+class RegisteredConverter(object):
+    """Converter in :class:`ConverterRegistry`, loaded on first use."""
+    __slots__ = ('validator_path', 'priority', 'order', 'distribution',
+                 '_load', '_converter')
+
+    def __init__(self, validator_path, load, priority=0, order=0,
+                 distribution=None):
+        """
+        :param distribution: ``name==version`` of distribution that declares
+                             the converter as an entry point.
+
+        """
+        self.validator_path = validator_path
+        self.priority = priority
+        self.order = order
+        self.distribution = distribution
+        self._load = load
+        self._converter = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._converter is not None
+
+    def load(self) -> ValidatorConverter:
+        """Import converter. Classes are instantiated without arguments."""
+        converter = self._converter
+        if converter is not None:
+            return converter
+        with _load_lock:
+            if self._converter is None:
+                converter = self._load()
+                if isinstance(converter, type):
+                    converter = converter()
+                self._converter = converter
+            return self._converter
+
+    def __repr__(self):
+        return '<RegisteredConverter {} priority={}{}>'.format(
+            self.validator_path, self.priority,
+            ' loaded' if self.loaded else '')
+
+
+class ConverterRegistry(object):
+    """
+    Registry of converters keyed by paths of validator classes they handle.
+    Converters are imported only when a validator of their class (or its
+    subclass) is converted first.
+
+    Plugins declare converters as entry points of
+    ``formencode_jsonschema.converters``. Names are paths of validator
+    classes, optionally with priority after ``@``. ::
+
+        entry_points={
+            'formencode_jsonschema.converters': [
+                'formencode.validators.Email = mypackage.converters:'
+                'EmailConverter',
+                'mypackage.validators.Slug@10 = mypackage.converters:'
+                'SlugConverter',
+            ],
+        }
+
+    Converters of higher priority come first. Among same priorities,
+    converters of more specific classes come first. They are used by
+    :class:`~.converters.RegistryConverter` of default converters.
+
+    """
+    def __init__(self, group=ENTRY_POINT_GROUP):
+        """
+        :param group: entry point group to load, or ``None`` to use only
+                      converters registered by :meth:`register`.
+
+        """
+        self.group = group
+        self._entries = None
+        self._registered = []
+        self._lock = threading.Lock()
+
+    def register(self, validator_path, converter, priority=0):
+        """
+        Register ``converter`` for validator class at ``validator_path``.
+        ``converter`` may be a converter, its class, or a path of them like
+        ``'package.module:Converter'`` that is imported lazily.
+
+        """
+        if isinstance(validator_path, type):
+            validator_path = class_path(validator_path)
+        if isinstance(converter, str):
+            def load(path=converter):
+                return _import_string(path)
+        else:
+            def load():
+                return converter
+        with self._lock:
+            registered = RegisteredConverter(validator_path, load, priority,
+                                             len(self._registered))
+            self._registered.append(registered)
+            if self._entries is not None:
+                self._entries.setdefault(registered.validator_path,
+                                         []).append(registered)
+
+    def _load_entries(self):
+        entries = {}
+        if self.group is not None:
+            for entry_point in _iter_entry_points(self.group):
+                validator_path, _, priority = entry_point.name.partition('@')
+                # Entry points come before converters registered by
+                # :meth:`register` of same priority.
+                registered = RegisteredConverter(
+                    validator_path.strip(), entry_point.load,
+                    int(priority) if priority else 0, -1,
+                    _distribution(entry_point))
+                entries.setdefault(registered.validator_path,
+                                   []).append(registered)
+        for registered in self._registered:
+            entries.setdefault(registered.validator_path,
+                               []).append(registered)
+        return entries
+
+    @property
+    def entries(self) -> dict:
+        """:class:`RegisteredConverter` lists by paths of validators."""
+        entries = self._entries
+        if entries is not None:
+            return entries
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_entries()
+            return self._entries
+
+    def find(self, validator_class) -> list:
+        """
+        Get :class:`RegisteredConverter` of ``validator_class`` and its base
+        classes in order of priority, without loading them.
+
+        """
+        entries = self.entries
+        found = []
+        for depth, cls in enumerate(validator_class.__mro__):
+            for registered in entries.get(class_path(cls), ()):
+                found.append((-registered.priority, depth, registered.order,
+                              registered))
+        found.sort(key=lambda x: x[:3])
+        return [x[-1] for x in found]
+
+    def converters_for(self, validator_class) -> list:
+        """Load converters of ``validator_class`` in order of priority."""
+        return [x.load() for x in self.find(validator_class)]
+
+
+#: Registry of converters declared by entry points.
+default_registry = ConverterRegistry()
@@ -1,8 +1,65 @@
-from marshmallow import Schema, fields
+import contextlib
+import threading
+
+from marshmallow import Schema, fields, missing, MarshalResult
 from formencode.api import Validator as FormencodeValidator
 from formencode.schema import Schema as FormencodeSchema
 
-from .converters import DEFAULT_CONVERTERS, SchemaDelegate
+from .cache import CachedSchema
+from .compiler import compile_schema
+from .converters import (DEFAULT_CONVERTERS, SchemaDelegate, FieldPlan,
+                         ConversionContext, get_converter_index, schema_key)
+from .encoding import EncodedSchema, encode_schema
+from .lazy import LazySchemaDocument, materialize
+from .profiling import ProfilingContext
+from .streaming import BUFFER_SIZE, iter_encoded
+
+
+#: Methods of :class:`~.converters.SchemaDelegate` that subclasses of
+#: :class:`JSONSchema` may override.
+DELEGATE_METHODS = ('can_convert', 'is_required', 'convert_validator',
+                    'convert_subschema')
+
+
+class CallbackContext(ConversionContext):
+    """
+    :class:`~.converters.ConversionContext` that calls back delegate methods
+    of :attr:`json_schema`, for subclasses of :class:`JSONSchema` that
+    override them.
+
+    """
+    #: :class:`JSONSchema` whose delegate methods are called.
+    json_schema = None
+
+    def can_convert(self, validator: FormencodeValidator):
+        return self.json_schema.can_convert(validator)
+
+    def is_required(self, validator: FormencodeValidator):
+        return self.json_schema.is_required(validator)
+
+    def convert_validator(self, validator: FormencodeValidator):
+        return self.json_schema.convert_validator(validator)
+
+    def convert_subschema(self, schema: FormencodeSchema):
+        return self.json_schema.convert_subschema(schema)
+
+    def plan_schema(self, schema) -> tuple:
+        return tuple(x._replace(required=self.is_required(x.validator))
+                     for x in super().plan_schema(schema))
+
+    def convert_field(self, field: FieldPlan):
+        return self.convert_validator(field.validator)
+
+
+class ProfilingCallbackContext(ProfilingContext, CallbackContext):
+    """:class:`CallbackContext` that records statistics too."""
+
+
+def _copy_object(cached: dict) -> dict:
+    document = dict(cached)
+    document['properties'] = dict(cached['properties'])
+    document['required'] = list(cached['required'])
+    return document
 
 
 class JSONSchema(Schema, SchemaDelegate):
@@ -12,27 +69,176 @@ class JSONSchema(Schema, SchemaDelegate):
     You can add more converters by overriding ``__validator_converters__``
     field.
 
+    Converted schemas can be cached by their classes with
+    :class:`~.cache.SchemaCache`. ::
+
+        json_schema = JSONSchema(cache=SchemaCache())
+
+    With ``lazy=True``, :meth:`dump` returns
+    :class:`~.lazy.LazySchemaDocument` that converts fields on demand, unless
+    the schema is in the cache.
+
+    Conversions can be profiled with
+    :class:`~.profiling.ConversionStats`. ::
+
+        json_schema = JSONSchema(stats=ConversionStats())
+
+    Conversion is done by :func:`~.compiler.compile_schema`. Marshmallow's
+    machinery is used only when options like ``only``, ``exclude`` or
+    processors customize the output.
+
+    An instance can be shared between threads. Each dump is converted in
+    its own :class:`~.converters.ConversionContext`, shared converter
+    indexes and caches are filled under locks, and dumps through
+    marshmallow's machinery are serialized. Converted fragments are
+    read-only and shared, so copy them before changing.
+
+    Converters get a :class:`~.converters.ConversionContext` as their
+    delegate. When a subclass overrides :data:`DELEGATE_METHODS`, they are
+    called back through :class:`CallbackContext`, and converted schemas are
+    not cached.
+
     """
     type = fields.Constant('object')
     properties = fields.Method('get_properties')
     required = fields.Method('get_required')
+    definitions = fields.Method('get_definitions')
 
     __validator_converters__ = DEFAULT_CONVERTERS
 
+    #: Default :class:`~.cache.SchemaCache` of converted schemas.
+    __schema_cache__ = None
+
+    def __init__(self, *args, cache=None, stats=None, lazy=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache if cache is not None else self.__schema_cache__
+        self.stats = stats
+        self.lazy = lazy
+        self._local = threading.local()
+        # Marshmallow keeps state of a dump in the schema.
+        self._marshmallow_lock = threading.RLock()
+        self._dumps_directly = self._can_dump_directly()
+        cls = type(self)
+        self._calls_back = any(getattr(cls, x) is not getattr(JSONSchema, x)
+                               for x in DELEGATE_METHODS)
+
+    def _can_dump_directly(self):
+        """Check that output of marshmallow is same with compiled schema."""
+        cls = type(self)
+        return (
+            not self._has_processors and
+            self.only is None and
+            not self.exclude and
+            not self.prefix and
+            not self.extra and
+            self.fields.keys() == JSONSchema._declared_fields.keys() and
+            cls.get_properties is JSONSchema.get_properties and
+            cls.get_required is JSONSchema.get_required and
+            cls.get_definitions is JSONSchema.get_definitions
+        )
+
+    def dump(self, obj, many=None, update_fields=True, **kwargs):
+        many = self.many if many is None else bool(many)
+        if not self._dumps_directly:
+            with self._marshmallow_lock, self.conversion_context():
+                return super().dump(obj, many=many,
+                                    update_fields=update_fields, **kwargs)
+        if not many:
+            with self.conversion_context():
+                return MarshalResult(self.convert_schema(obj), {})
+        data = []
+        for schema in obj:
+            with self.conversion_context():
+                data.append(self.convert_schema(schema))
+        return MarshalResult(data, {})
+
+    def dumps(self, obj, many=None, update_fields=True, *args, **kwargs):
+        if self.lazy:
+            kwargs.setdefault('default', materialize)
+        return super().dumps(obj, many, update_fields, *args, **kwargs)
+
     def get_required(self, schema: FormencodeSchema):
-        fields = schema.fields
-        required = []
-        for name, validator in fields.items():
-            if self.is_required(validator):
-                required.append(name)
-        return required
+        return self.convert_schema(schema)['required']
 
     def get_properties(self, schema: FormencodeSchema):
-        fields = schema.fields
-        properties = {}
-        for name, validator in fields.items():
-            properties[name] = self.convert_validator(validator)
-        return properties
+        return self.convert_schema(schema)['properties']
+
+    def get_definitions(self, schema: FormencodeSchema):
+        return self.convert_schema(schema).get('definitions', missing)
+
+    def convert_schema(self, schema: FormencodeSchema) -> dict:
+        """Convert formencode schema into JSON schema."""
+        cached = self.get_cached(schema)
+        if cached is None:
+            context = self.get_conversion_context()
+            if self.lazy and self._dumps_directly:
+                context.set_root(schema)
+                return LazySchemaDocument(schema, context)
+            return compile_schema(schema, context=context)
+        # Objects are copied as deep as they are built by conversions.
+        document = _copy_object(cached)
+        if 'definitions' in cached:
+            document['definitions'] = {
+                name: _copy_object(x)
+                for name, x in cached['definitions'].items()
+            }
+        return document
+
+    def encode(self, schema: FormencodeSchema) -> EncodedSchema:
+        """
+        Convert formencode schema into canonical JSON bytes with ETag.
+        Encoded bytes are cached with the schema in :attr:`cache`. ::
+
+            encoded = json_schema.encode(SomeSchema)
+            if encoded.not_modified(request.headers.get('If-None-Match')):
+                return Response(status=304)
+            return Response(encoded.view(), headers={'ETag': encoded.etag})
+
+        """
+        entry = self._get_cache_entry(schema)
+        if entry is None:
+            with self.conversion_context():
+                return encode_schema(self.convert_schema(schema))
+        if entry.encoded is None:
+            entry.encoded = encode_schema(entry.document)
+        return entry.encoded
+
+    def stream(self, schema: FormencodeSchema, buffer_size=BUFFER_SIZE):
+        """
+        Convert formencode schema into UTF-8 JSON chunks with
+        :func:`~.streaming.iter_encoded`, field by field. Options of
+        marshmallow, :attr:`cache` and overridden delegate methods are not
+        applied.
+
+        """
+        return iter_encoded(schema, context=self.make_conversion_context(),
+                            buffer_size=buffer_size)
+
+    def get_cached(self, schema: FormencodeSchema):
+        """
+        Get cached conversion of ``schema`` from :attr:`cache`, converting it
+        on miss. Returns ``None`` if ``schema`` can not be cached.
+
+        """
+        entry = self._get_cache_entry(schema)
+        if entry is None:
+            return None
+        return entry.document
+
+    def _get_cache_entry(self, schema: FormencodeSchema):
+        # Overridden delegate methods may convert same classes differently.
+        if self.cache is None or self._calls_back:
+            return None
+        schema_class = schema_key(schema)
+        if not isinstance(schema_class, type):
+            return None
+        converters = self.__validator_converters__
+        entry = self.cache.get(schema_class, converters)
+        if entry is None:
+            entry = CachedSchema(compile_schema(
+                schema, context=self.get_conversion_context()))
+            self.cache.set(schema_class, converters, entry)
+        return entry
 
     def handle_unknown_validator(self, validator: FormencodeValidator):
         """When schema found unknown validator, handle that here."""
@@ -40,23 +246,68 @@ class JSONSchema(Schema, SchemaDelegate):
             "Can not convert a validator {validator!r}"
             .format(validator=validator))
 
+    @property
+    def converter_index(self):
+        """:class:`~.converters.ConverterIndex` of validator converters."""
+        return get_converter_index(self.__validator_converters__)
+
+    def make_conversion_context(self) -> ConversionContext:
+        """Make new :class:`~.converters.ConversionContext`."""
+        if self.stats is not None:
+            context_class = ProfilingCallbackContext if self._calls_back \
+                else ProfilingContext
+            context = context_class(self.converter_index,
+                                    self.handle_unknown_validator,
+                                    stats=self.stats)
+        else:
+            context_class = CallbackContext if self._calls_back \
+                else ConversionContext
+            context = context_class(self.converter_index,
+                                    self.handle_unknown_validator)
+        if self._calls_back:
+            context.json_schema = self
+        return context
+
+    @contextlib.contextmanager
+    def conversion_context(self):
+        """
+        Share a conversion context in current thread until the block exits.
+        :meth:`dump` converts each schema in its own context.
+
+        """
+        stack = self._local.__dict__.setdefault('contexts', [])
+        context = self.make_conversion_context()
+        stack.append(context)
+        try:
+            yield context
+        finally:
+            stack.pop()
+
+    def get_conversion_context(self) -> ConversionContext:
+        """Get active conversion context, or make new one."""
+        stack = self._local.__dict__.get('contexts')
+        if stack:
+            return stack[-1]
+        return self.make_conversion_context()
+
+    def _delegate_context(self):
+        context = self.get_conversion_context()
+        if isinstance(context, CallbackContext):
+            # Skip callbacks, which came here.
+            return super(CallbackContext, context)
+        return context
+
     # Delegate implementations
 
     def can_convert(self, validator: FormencodeValidator):
-        for converter in self.__validator_converters__:
-            if converter.can_convert(validator, self):
-                return True
-        return False
+        return self._delegate_context().can_convert(validator)
 
     def is_required(self, validator: FormencodeValidator):
-        for converter in self.__validator_converters__:
-            if converter.can_convert(validator, self) and \
-                    converter.is_required(validator, self):
-                return True
-        return False
+        return self._delegate_context().is_required(validator)
 
     def convert_validator(self, validator: FormencodeValidator):
-        for converter in self.__validator_converters__:
-            if converter.can_convert(validator, self):
-                return converter.convert(validator, self)
-        return self.handle_unknown_validator(validator)
+        return self._delegate_context().convert_validator(validator)
+
+    def convert_subschema(self, schema: FormencodeSchema):
+        return self._delegate_context().convert_subschema(schema)
+
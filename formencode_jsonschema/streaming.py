@@ -0,0 +1,84 @@
+import json
+
+from formencode.schema import Schema as FormencodeSchema
+
+from .converters import (DEFAULT_CONVERTERS, ConversionContext,
+                         get_converter_index)
+
+
+#: Default minimum size of chunks in characters.
+BUFFER_SIZE = 8192
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _iter_parts(schema: FormencodeSchema, context: ConversionContext):
+    context.set_root(schema)
+    find_all = context.index.find_all
+    required = []
+    yield '{"type":"object","properties":{'
+    # Fields of the root are resolved without memoizing them in the
+    # context, because each of them is visited only once.
+    for i, (name, validator) in enumerate(schema.fields.items()):
+        converters = find_all(validator, context)
+        converter = converters[0] if converters else None
+        if any(x.is_required(validator, context) for x in converters):
+            required.append(name)
+        yield '{}{}:{}'.format(',' if i else '', _encode(name),
+                               _encode(context.convert_with(converter,
+                                                            validator)))
+    yield '},"required":'
+    yield _encode(required)
+    # Nested schemas are known after all fields are converted.
+    if context.definitions:
+        yield ',"definitions":{'
+        for i, (name, definition) in enumerate(context.definitions.items()):
+            yield '{}{}:{}'.format(',' if i else '', _encode(name),
+                                   _encode(definition))
+        yield '}'
+    yield '}'
+
+
+def iter_schema(schema: FormencodeSchema, converters=DEFAULT_CONVERTERS,
+                context: ConversionContext=None, buffer_size=BUFFER_SIZE):
+    """
+    Convert formencode ``schema`` into JSON text chunks, field by field, so
+    the whole document is never built. Joined chunks are same with
+    :func:`~.compiler.compile_schema` encoded as JSON. ::
+
+        with open('schema.json', 'w') as f:
+            f.writelines(iter_schema(HugeSchema))
+
+    Definitions of nested schemas are kept until they are written.
+
+    :param buffer_size: minimum size of chunks. Fields are yielded one by
+                        one if it is 0.
+
+    """
+    if context is None:
+        context = ConversionContext(get_converter_index(converters))
+    buffer = []
+    size = 0
+    for part in _iter_parts(schema, context):
+        buffer.append(part)
+        size += len(part)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_encoded(schema: FormencodeSchema, converters=DEFAULT_CONVERTERS,
+                 context: ConversionContext=None, buffer_size=BUFFER_SIZE):
+    """
+    Like :func:`iter_schema`, but yields UTF-8 bytes, e.g. for WSGI
+    responses. ::
+
+        return Response(app_iter=iter_encoded(HugeSchema),
+                        content_type='application/schema+json')
+
+    """
+    for chunk in iter_schema(schema, converters, context, buffer_size):
+        yield chunk.encode('utf-8')
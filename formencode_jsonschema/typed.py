@@ -1,5 +1,7 @@
 from formencode.api import FancyValidator, NoDefault
 
+from .utils import intern_fragment
+
 
 class JSONTyped(FancyValidator):
     """
@@ -18,6 +20,13 @@ class JSONTyped(FancyValidator):
     required = NoDefault
     description = None
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Equal JSON types are shared between validators as read-only.
+        json_type = getattr(self, 'json_type', None)
+        if json_type is not None:
+            self.json_type = intern_fragment(json_type)
+
     def _convert_to_python(self, value, state=None):
         return self.validator.to_python(value, state)
 
@@ -1,9 +1,133 @@
 import datetime
 import decimal
+import threading
 import uuid
+import weakref
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict for JSON schema fragments that are shared between
+    converted schemas. It is still a dict, so it can be encoded by
+    :mod:`json` directly. Use :meth:`copy` to get a mutable copy.
+
+    """
+    __slots__ = ('_hash', '__weakref__')
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("'{}' object is immutable".format(
+            type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def copy(self) -> dict:
+        """Get mutable shallow copy."""
+        return dict(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+
+class FrozenList(list):
+    """Read-only list for JSON schema fragments, like :class:`FrozenDict`."""
+    __slots__ = ('__weakref__',)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("'{}' object is immutable".format(
+            type(self).__name__))
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = remove = pop = clear = _immutable
+    sort = reverse = _immutable
+
+    def copy(self) -> list:
+        """Get mutable shallow copy."""
+        return list(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+
+def freeze(value):
+    """Convert dicts and lists in JSON value into read-only ones."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(x) for x in value)
+    return value
+
+
+_interned = weakref.WeakValueDictionary()
+_interned_lock = threading.Lock()
+
+
+def _structural_key(value):
+    # Types are part of key, because ``1 == 1.0 == True`` in python.
+    if isinstance(value, dict):
+        return dict, frozenset((k, _structural_key(v))
+                               for k, v in value.items())
+    if isinstance(value, list):
+        return list, tuple(_structural_key(x) for x in value)
+    return type(value), value
+
+
+def intern_fragment(value):
+    """
+    Get shared read-only instance of JSON schema fragment. Structurally
+    equal fragments are stored only once while they are in use. ::
+
+        >>> fragment = intern_fragment({'type': 'string'})
+        >>> fragment is intern_fragment({'type': 'string'})
+        True
+
+    """
+    if not isinstance(value, (dict, list, tuple)):
+        return value
+    if isinstance(value, dict):
+        frozen = FrozenDict((k, intern_fragment(v)) for k, v in value.items())
+    else:
+        frozen = FrozenList(intern_fragment(x) for x in value)
+    try:
+        key = _structural_key(frozen)
+        return _interned[key]
+    except TypeError:
+        # Unhashable values can not be shared.
+        return frozen
+    except KeyError:
+        pass
+    # ``setdefault`` of ``WeakValueDictionary`` isn't atomic.
+    with _interned_lock:
+        return _interned.setdefault(key, frozen)
+
 
 # From https://github.com/fuhrysteve/marshmallow-jsonschema/blob/master/marshmallow_jsonschema/base.py
-TYPE_MAP = {
+_TYPE_MAP = {
     dict: {
         'type': 'object',
     },
@@ -58,6 +182,12 @@ TYPE_MAP = {
 }
 
 
-def get_type_base(python_type) -> dict:
-    """Get base schema for python type."""
+#: Read-only base schemas of python types. Values are shared, so make a copy
+#: before adding keys.
+TYPE_MAP = {k: intern_fragment(v) for k, v in _TYPE_MAP.items()}
+del _TYPE_MAP
+
+
+def get_type_base(python_type) -> FrozenDict:
+    """Get read-only base schema for python type."""
     return TYPE_MAP.get(python_type, None)
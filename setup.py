@@ -9,12 +9,18 @@ setup(
     url='https://github.com/hardtack/formencode_jsonschema',
     packages=find_packages(),
     include_package_data=True,
+    python_requires='>=3.7',
     install_requires=['marshmallow>=2.3.0', 'formencode'],
     zip_safe=False,
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
 )
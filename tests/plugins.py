@@ -0,0 +1,12 @@
+"""Converters loaded by registry tests."""
+from formencode import validators as v
+
+from formencode_jsonschema.converters import SimpleValidatorConverter
+
+
+class EmailConverter(SimpleValidatorConverter):
+    def __init__(self):
+        super().__init__(v.Email, str)
+
+    def convert(self, validator, delegate):
+        return {'type': 'string', 'format': 'email'}
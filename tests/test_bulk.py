@@ -0,0 +1,49 @@
+import pytest
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import compile_schema
+from formencode_jsonschema.__main__ import main
+from formencode_jsonschema.bulk import (BulkConversionError, convert_many,
+                                        ConversionError)
+from formencode_jsonschema.bundle import build_bundle
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+
+
+class UserUpdate(Schema):
+    description = v.UnicodeString(if_missing=None)
+
+
+class Invitation(Schema):
+    email = v.Email(not_empty=True)
+
+
+SCHEMAS = [UserCreate, Invitation, UserUpdate] * 5
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_convert_many(workers):
+    documents, errors = convert_many(SCHEMAS, workers=workers, chunksize=2)
+    assert documents == [
+        None if x is Invitation else compile_schema(x) for x in SCHEMAS
+    ]
+    assert len(errors) == 5
+    assert all(isinstance(x, ConversionError) for x in errors)
+    assert errors[0].schema_name == 'tests.test_bulk.Invitation'
+    assert 'ValueError' in str(errors[0])
+
+
+def test_build_bundle_collects_errors():
+    with pytest.raises(BulkConversionError) as excinfo:
+        build_bundle([UserCreate, Invitation], workers=2)
+    assert [x.schema_name for x in excinfo.value.errors] == [
+        'tests.test_bulk.Invitation',
+    ]
+
+
+def test_build_command_with_errors(tmpdir, capsys):
+    path = str(tmpdir.join('schemas.json'))
+    assert main(['build', '-j', '2', '-o', path, __name__]) == 1
+    assert 'tests.test_bulk.Invitation' in capsys.readouterr().err
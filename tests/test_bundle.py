@@ -0,0 +1,58 @@
+import json
+
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema, compile_schema
+from formencode_jsonschema.__main__ import main
+from formencode_jsonschema.bundle import build_bundle, find_schemas
+from formencode_jsonschema.loader import MappedBundle, SchemaBundle
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+
+
+class UserUpdate(Schema):
+    description = v.UnicodeString(if_missing=None)
+
+
+def test_find_schemas():
+    assert find_schemas([__name__]) == [UserCreate, UserUpdate]
+
+
+def test_build_bundle():
+    bundle = SchemaBundle.from_dict(build_bundle([UserCreate, UserUpdate]))
+    assert bundle.names() == ['tests.test_bundle.UserCreate',
+                              'tests.test_bundle.UserUpdate']
+    assert bundle['tests.test_bundle.UserCreate'] == \
+        compile_schema(UserCreate)
+
+
+def test_build_command(tmpdir):
+    path = str(tmpdir.join('schemas.json'))
+    assert main(['build', '-o', path, __name__]) == 0
+    bundle = SchemaBundle.load(path)
+    assert len(bundle) == 2
+    assert bundle.get('tests.test_bundle.UserUpdate') == {
+        'type': 'object',
+        'properties': {'description': {'type': 'string'}},
+        'required': [],
+    }
+    with open(path) as f:
+        assert json.load(f)['version'] == 1
+
+
+def test_binary_bundle(tmpdir):
+    path = str(tmpdir.join('schemas.bin'))
+    assert main(['build', '--format', 'binary', '-o', path, __name__]) == 0
+    with MappedBundle(path) as bundle:
+        name = 'tests.test_bundle.UserCreate'
+        assert bundle.names() == ['tests.test_bundle.UserCreate',
+                                  'tests.test_bundle.UserUpdate']
+        encoded = JSONSchema().encode(UserCreate)
+        with bundle.raw(name) as view:
+            assert view.tobytes() == encoded.data
+        assert bundle.etag(name) == encoded.etag
+        assert bundle[name] == compile_schema(UserCreate)
+        assert bundle[name] is bundle.get(name)
+        assert bundle.get('unknown') is None
@@ -0,0 +1,83 @@
+import gc
+
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.cache import SchemaCache
+from formencode_jsonschema.converters import DEFAULT_CONVERTERS
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    description = v.UnicodeString(if_missing=None)
+
+
+def test_cached_dump():
+    cache = SchemaCache()
+    json_schema = JSONSchema(cache=cache)
+    first = json_schema.dump(UserCreate()).data
+    second = json_schema.dump(UserCreate()).data
+    assert first == second
+    assert first['required'] == ['username']
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_instance_fields_are_not_cached():
+    cache = SchemaCache()
+    json_schema = JSONSchema(cache=cache)
+    result = json_schema.dump(UserCreate(name=v.Int(not_empty=True)))
+    assert result.data['properties']['name'] == {'type': 'integer'}
+    assert len(cache) == 0
+    assert 'name' not in json_schema.dump(UserCreate()).data['properties']
+
+
+def test_lru_eviction():
+    cache = SchemaCache(maxsize=2)
+    schemas = [type('S{}'.format(i), (Schema,), {'a': v.Int()})
+               for i in range(3)]
+    for schema in schemas:
+        cache.set(schema, DEFAULT_CONVERTERS, {})
+    assert cache.get(schemas[0], DEFAULT_CONVERTERS) is None
+    assert cache.get(schemas[2], DEFAULT_CONVERTERS) == {}
+    assert len(cache) == 2
+
+
+def test_invalidate_and_clear():
+    cache = SchemaCache()
+    json_schema = JSONSchema(cache=cache)
+    json_schema.dump(UserCreate())
+    cache.invalidate(UserCreate)
+    assert len(cache) == 0
+    json_schema.dump(UserCreate())
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 128, 0)
+
+
+def test_classes_are_weakly_referenced():
+    cache = SchemaCache()
+    schema = type('Temporary', (Schema,), {'a': v.Int()})
+    JSONSchema(cache=cache).dump(schema())
+    assert len(cache) == 1
+    del schema
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_cached_documents_are_not_shared():
+    class Address(Schema):
+        street = v.UnicodeString(not_empty=True)
+
+    class User(Schema):
+        home = Address()
+
+    json_schema = JSONSchema(cache=SchemaCache())
+    first = json_schema.dump(User).data
+    first['required'].append('extra')
+    first['properties']['extra'] = {}
+    first['definitions']['Address']['required'].append('extra')
+    first['definitions']['Address']['properties']['extra'] = {}
+    second = json_schema.dump(User).data
+    assert second == JSONSchema().dump(User).data
+    assert json_schema.get_cached(User)['definitions']['Address'] == \
+        second['definitions']['Address']
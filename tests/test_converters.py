@@ -0,0 +1,178 @@
+import re
+
+from formencode import Schema, validators as v, compound
+
+from formencode_jsonschema import JSONSchema, typed
+from formencode_jsonschema.converters import (
+    DEFAULT_CONVERTERS, ConverterIndex, SimpleValidatorConverter,
+    RegexValidatorConverter,
+    AllValidatorConverter, PipeValidatorConverter, SIMPLE_CONVERTERS,
+    get_converter_index,
+)
+
+
+def test_index_resolves_along_mro():
+    index = ConverterIndex(DEFAULT_CONVERTERS)
+    candidates = index.candidates(v.PlainText)
+    assert [type(x) for x, _ in candidates] == [RegexValidatorConverter]
+    converter, exact = candidates[0]
+    assert converter.validator_class is v.Regex
+    assert exact
+
+
+def test_index_asks_overridden_can_convert():
+    class StrippedConverter(SimpleValidatorConverter):
+        def can_convert(self, validator, delegate):
+            return validator.strip
+
+    stripped = StrippedConverter(v.UnicodeString, bytes)
+    index = ConverterIndex((stripped,) + DEFAULT_CONVERTERS)
+    assert index.candidates(v.UnicodeString)[0] == (stripped, False)
+    json_schema = JSONSchema()
+    assert index.find(v.UnicodeString(strip=True), json_schema) is stripped
+    assert index.find(v.UnicodeString(strip=False), json_schema) is not \
+        stripped
+
+
+def test_index_keeps_predicate_converters():
+    index = ConverterIndex(DEFAULT_CONVERTERS)
+    candidates = index.candidates(compound.All)
+    assert [(type(x), exact) for x, exact in candidates] == [
+        (AllValidatorConverter, False),
+    ]
+    json_schema = JSONSchema()
+    assert index.find(compound.All(v.Int()), json_schema) is candidates[0][0]
+    assert index.find(compound.All(v.Email()), json_schema) is None
+
+
+def test_index_is_shared_per_converter_set():
+    assert get_converter_index(DEFAULT_CONVERTERS) is \
+        get_converter_index(list(DEFAULT_CONVERTERS))
+    assert JSONSchema().converter_index is \
+        get_converter_index(DEFAULT_CONVERTERS)
+
+
+def test_custom_converter_without_class():
+    class EmailConverter(SimpleValidatorConverter):
+        def __init__(self):
+            super().__init__(v.Email, str)
+
+        def match_class(self, validator_class):
+            return None
+
+    class CustomJSONSchema(JSONSchema):
+        __validator_converters__ = DEFAULT_CONVERTERS + (EmailConverter(),)
+
+    json_schema = CustomJSONSchema()
+    assert json_schema.convert_validator(v.Email()) == {'type': 'string'}
+    assert json_schema.can_convert(v.Email())
+    assert not JSONSchema().can_convert(v.Email())
+
+
+def test_constraints():
+    json_schema = JSONSchema()
+    convert = json_schema.convert_validator
+    assert convert(v.UnicodeString(min=2, max=8)) == {
+        'type': 'string', 'minLength': 2, 'maxLength': 8,
+    }
+    assert convert(v.Int(min=0)) == {'type': 'integer', 'minimum': 0}
+    assert convert(v.Number(max=1.5)) == {
+        'type': 'number', 'format': 'float', 'maximum': 1.5,
+    }
+    assert convert(v.Regex(r'^\d+$')) == {'type': 'string',
+                                           'pattern': r'^\d+$'}
+    assert convert(v.Regex(re.compile('^a'))) == {'type': 'string',
+                                                  'pattern': '^a'}
+    assert convert(v.Regex('^a', regexOps=('I',))) == {'type': 'string'}
+    assert convert(v.Regex(r'^\d+$', strip=True)) == {'type': 'string'}
+    assert convert(v.UnicodeString(max=2, strip=True)) == {'type': 'string'}
+    assert convert(v.OneOf(['a', 'b'])) == {'enum': ['a', 'b']}
+    assert convert(v.OneOf([1, 2], testValueList=True)) == {
+        'type': 'array', 'items': {'enum': [1, 2]},
+    }
+    assert convert(v.OneOf([object()])) == {}
+    assert convert(v.OneOf({'red', 'green', 'blue', 'cyan'})) == {
+        'enum': ['blue', 'cyan', 'green', 'red'],
+    }
+    assert convert(v.OneOf(frozenset(['b', 1, None, 'a']))) == {
+        'enum': [1, 'a', 'b', None],
+    }
+    assert convert(v.UnicodeString()) is convert(v.UnicodeString)
+
+
+def test_portable_patterns():
+    json_schema = JSONSchema()
+    convert = json_schema.convert_validator
+    assert convert(v.Regex(r'\A(?P<id>\d+)-(?P=id)\Z')) == {
+        'type': 'string', 'pattern': r'^(?<id>\d+)-\k<id>$',
+    }
+    assert convert(v.Regex(r'^[]A]\\Z$')) == {'type': 'string',
+                                            'pattern': r'^[]A]\\Z$'}
+    assert convert(v.Regex(r'(?i)^a')) == {'type': 'string'}
+    assert convert(v.Regex(r'^a(?#comment)')) == {'type': 'string'}
+    assert convert(v.Regex(r'^a++$')) == {'type': 'string'}
+
+
+def test_constraints_are_memoized():
+    json_schema = JSONSchema()
+    convert = json_schema.convert_validator
+    assert convert(v.UnicodeString(max=3)) is convert(v.UnicodeString(max=3))
+    assert convert(v.PlainText()) is convert(v.PlainText())
+    assert convert(v.Number(max=1))['maximum'] == 1
+    assert type(convert(v.Number(max=1.0))['maximum']) is float
+    assert convert(v.UnicodeString(max=3, strip=True)) == {'type': 'string'}
+    validator = v.UnicodeString(max=3)
+    validator.max = 4
+    assert convert(validator) == {'type': 'string', 'maxLength': 4}
+
+
+def nested_validator(depth):
+    validator = v.UnicodeString(not_empty=True)
+    for i in range(depth):
+        wrapper = compound.All if i % 2 else compound.Pipe
+        validator = wrapper(validator, v.PlainText())
+    return validator
+
+
+def count_can_convert(depth):
+    calls = []
+
+    class CountingAllConverter(AllValidatorConverter):
+        def can_convert(self, validator, delegate):
+            calls.append(validator)
+            return super().can_convert(validator, delegate)
+
+    class CountingPipeConverter(PipeValidatorConverter):
+        def can_convert(self, validator, delegate):
+            calls.append(validator)
+            return super().can_convert(validator, delegate)
+
+    class CountingJSONSchema(JSONSchema):
+        __validator_converters__ = SIMPLE_CONVERTERS + (
+            CountingAllConverter(),
+            CountingPipeConverter(),
+        )
+
+    class Nested(Schema):
+        name = nested_validator(depth)
+
+    result = CountingJSONSchema().dump(Nested())
+    assert result.data['properties'] == {'name': {'type': 'string'}}
+    return len(calls)
+
+
+def test_nested_compound_classified_once():
+    assert count_can_convert(10) == 10
+    assert count_can_convert(40) == 40
+
+
+def test_converted_fragments_are_shared_read_only():
+    json_schema = JSONSchema()
+    first = json_schema.convert_validator(v.UnicodeString())
+    second = json_schema.convert_validator(v.UnicodeString(not_empty=True))
+    assert first is second
+    json_type = {'type': 'string'}
+    converted = json_schema.convert_validator(
+        typed.JSONTyped(json_type, v.Int(), description='Number'))
+    assert converted == {'type': 'string', 'description': 'Number'}
+    assert json_type == {'type': 'string'}
@@ -1,10 +1,16 @@
 from formencode import Schema, validators as v, compound
 
-from formencode_jsonschema import JSONSchema, typed
+from formencode_jsonschema import JSONSchema, compile_schema, typed
 
 from .utils import compare_schema
 
 
+PLAIN_TEXT = {
+    'type': 'string',
+    'pattern': v.PlainText.regex,
+}
+
+
 def test_simple_dump():
     class UserCreate(Schema):
         username = v.PlainText(not_empty=True)
@@ -20,18 +26,14 @@ def test_simple_dump():
         'required': ['name', 'password', 'username'],
         'type': 'object',
         'properties': {
-            'username': {
-                'type': 'string'
-            },
+            'username': PLAIN_TEXT,
             'name': {
                 'type': 'string'
             },
             'description': {
                 'type': 'string'
             },
-            'password': {
-                'type': 'string'
-            }
+            'password': PLAIN_TEXT
         }
     }, result.data)
 
@@ -80,3 +82,89 @@ def test_typed_dump():
             }
         }
     }, result.data)
+
+
+def test_compile_schema():
+    class UserCreate(Schema):
+        username = v.PlainText(not_empty=True)
+        description = v.UnicodeString(if_missing=None)
+
+    compiled = compile_schema(UserCreate())
+    assert compiled == JSONSchema().dump(UserCreate()).data
+    compare_schema({
+        'required': ['username'],
+        'type': 'object',
+        'properties': {
+            'username': PLAIN_TEXT,
+            'description': {
+                'type': 'string'
+            }
+        }
+    }, compiled)
+
+
+def test_marshmallow_options_dump():
+    class UserCreate(Schema):
+        username = v.PlainText(not_empty=True)
+
+    result = JSONSchema(only=('properties',)).dump(UserCreate())
+    assert result.data == {'properties': {'username': PLAIN_TEXT}}
+    result = JSONSchema().dump([UserCreate(), UserCreate()], many=True)
+    assert [x['required'] for x in result.data] == [['username'],
+                                                    ['username']]
+
+
+def test_class_dump():
+    class Address(Schema):
+        street = v.UnicodeString(not_empty=True)
+
+    class UserCreate(Schema):
+        username = v.PlainText(not_empty=True)
+        name = compound.All(v.UnicodeString(not_empty=True), v.PlainText())
+        really = typed.BooleanTyped(v.UnicodeString(), required=True)
+        home = Address
+        nickname = v.UnicodeString
+
+    expected = JSONSchema().dump(UserCreate()).data
+    assert JSONSchema().dump(UserCreate).data == expected
+    assert JSONSchema(exclude=('definitions',)).dump(UserCreate).data == \
+        JSONSchema(exclude=('definitions',)).dump(UserCreate()).data
+    assert compile_schema(UserCreate) == expected
+    assert expected['properties']['home'] == {'$ref': '#/definitions/Address'}
+    assert expected['properties']['nickname'] == {'type': 'string'}
+    assert 'nickname' in expected['required']
+
+
+def test_overridden_delegate_methods():
+    class Address(Schema):
+        street = v.UnicodeString(if_missing=None)
+
+    class UserCreate(Schema):
+        name = v.UnicodeString(if_missing=None)
+        email = v.Email()
+        home = Address()
+        emails = compound.All(v.Email(), v.UnicodeString())
+
+    class Loud(JSONSchema):
+        def is_required(self, validator):
+            return True
+
+    assert Loud().dump(Address).data['required'] == ['street']
+
+    class EmailJSONSchema(JSONSchema):
+        def can_convert(self, validator):
+            return isinstance(validator, v.Email) or \
+                super().can_convert(validator)
+
+        def convert_validator(self, validator):
+            if isinstance(validator, v.Email):
+                return {'type': 'string', 'format': 'email'}
+            return super().convert_validator(validator)
+
+    email = {'type': 'string', 'format': 'email'}
+    for json_schema in (EmailJSONSchema(), EmailJSONSchema(lazy=True),
+                        EmailJSONSchema(only=('properties', 'required'))):
+        result = json_schema.dump(UserCreate).data
+        assert result['properties']['email'] == email
+        assert result['properties']['emails'] == email
+        assert list(result['required']) == ['home', 'emails']
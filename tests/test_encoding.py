@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.cache import SchemaCache
+from formencode_jsonschema.encoding import encode_schema
+
+
+PLAIN_TEXT = {'type': 'string', 'pattern': v.PlainText.regex}
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    name = v.UnicodeString(not_empty=True)
+    description = v.UnicodeString(if_missing=None)
+
+
+def test_canonical_encoding():
+    encoded = JSONSchema().encode(UserCreate())
+    assert json.loads(encoded.data.decode('utf-8')) == {
+        'type': 'object',
+        'required': ['name', 'username'],
+        'properties': {
+            'username': PLAIN_TEXT,
+            'name': {'type': 'string'},
+            'description': {'type': 'string'},
+        },
+    }
+    assert encoded.data.startswith(b'{"properties":{"description"')
+    reordered = encode_schema({
+        'type': 'object',
+        'required': ['username', 'name'],
+        'properties': {
+            'description': {'type': 'string'},
+            'name': {'type': 'string'},
+            'username': PLAIN_TEXT,
+        },
+    })
+    assert reordered.data == encoded.data
+    assert reordered.etag == encoded.etag
+
+
+def test_etag_of_sets():
+    statement = (
+        'from formencode import Schema, validators as v\n'
+        'from formencode_jsonschema import JSONSchema\n'
+        'class Paint(Schema):\n'
+        "    color = v.OneOf({'red', 'green', 'blue', 'cyan'})\n"
+        'print(JSONSchema().encode(Paint).etag)'
+    )
+    etags = set()
+    for seed in ('1', '2', '3'):
+        process = subprocess.run(
+            [sys.executable, '-c', statement],
+            stdout=subprocess.PIPE, universal_newlines=True, check=True,
+            env=dict(os.environ, PYTHONHASHSEED=seed),
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        etags.add(process.stdout)
+    assert len(etags) == 1
+
+
+def test_cached_encoding():
+    cache = SchemaCache()
+    json_schema = JSONSchema(cache=cache)
+    encoded = json_schema.encode(UserCreate())
+    assert json_schema.encode(UserCreate()) is encoded
+    assert json_schema.encode(UserCreate).view().tobytes() == encoded.data
+    assert cache.cache_info().misses == 1
+
+
+def test_not_modified():
+    encoded = JSONSchema().encode(UserCreate())
+    assert encoded.not_modified(encoded.etag)
+    assert encoded.not_modified('"other", W/' + encoded.etag)
+    assert encoded.not_modified('*')
+    assert not encoded.not_modified('"other"')
+    assert not encoded.not_modified(None)
@@ -0,0 +1,87 @@
+from formencode import Schema, validators as v, compound
+
+from formencode_jsonschema import typed
+from formencode_jsonschema.bundle import build_bundle
+from formencode_jsonschema.cache import DiskSchemaCache
+from formencode_jsonschema.converters import (DEFAULT_CONVERTERS,
+                                              SIMPLE_CONVERTERS,
+                                              SimpleValidatorConverter)
+from formencode_jsonschema.fingerprint import schema_fingerprint
+from formencode_jsonschema.registry import (ConverterRegistry,
+                                            RegistryConverter)
+
+
+def make_schema(**fields):
+    attrs = {
+        'username': v.PlainText(not_empty=True),
+        'name': compound.All(v.UnicodeString(), v.PlainText()),
+        'really': typed.BooleanTyped(v.UnicodeString(), required=True),
+    }
+    attrs.update(fields)
+    return type('UserCreate', (Schema,), attrs)
+
+
+def test_fingerprint_is_stable():
+    assert schema_fingerprint(make_schema()) == \
+        schema_fingerprint(make_schema())
+    assert schema_fingerprint(make_schema()) == \
+        schema_fingerprint(make_schema()())
+
+
+def test_fingerprint_changes():
+    fingerprint = schema_fingerprint(make_schema())
+    changed = [
+        make_schema(username=v.PlainText()),
+        make_schema(username=v.UnicodeString(not_empty=True)),
+        make_schema(name=compound.All(v.UnicodeString(if_missing=None),
+                                      v.PlainText())),
+        make_schema(really=typed.BooleanTyped(v.UnicodeString())),
+        make_schema(really=typed.BooleanTyped(v.UnicodeString(),
+                                              required=True,
+                                              description='Really?')),
+        make_schema(extra=v.Int()),
+        make_schema(extra=v.Int(max=10)),
+        make_schema(extra=v.OneOf(['a', 'b'])),
+        make_schema(extra=v.OneOf(['a', 'c'])),
+        make_schema(extra=v.OneOf({'a', 'b', 'c'})),
+        make_schema(username=v.Regex('^[a-z]+$', not_empty=True)),
+        make_schema(extra=v.UnicodeString(min=2)),
+        make_schema(extra=v.UnicodeString(min=2, strip=True)),
+    ]
+    fingerprints = {schema_fingerprint(x) for x in changed}
+    assert len(fingerprints) == len(changed)
+    assert fingerprint not in fingerprints
+    assert schema_fingerprint(make_schema(), SIMPLE_CONVERTERS) != \
+        fingerprint
+
+
+class EmailConverter(SimpleValidatorConverter):
+    def __init__(self):
+        super().__init__(v.Email, str)
+
+
+class EmailConverter2(EmailConverter):
+    version = 2
+
+
+def test_fingerprint_of_registry():
+    registry = ConverterRegistry(group=None)
+    converters = (RegistryConverter(registry),) + DEFAULT_CONVERTERS[1:]
+    schema = make_schema()
+    fingerprints = {schema_fingerprint(schema, converters)}
+    registry.register(v.Email, EmailConverter)
+    fingerprints.add(schema_fingerprint(schema, converters))
+    registry.register(v.Email, EmailConverter2, priority=1)
+    fingerprints.add(schema_fingerprint(schema, converters))
+    assert len(fingerprints) == 3
+    assert schema_fingerprint(schema, converters) in fingerprints
+
+
+def test_disk_cache(tmpdir):
+    schema_class = make_schema()
+    first = DiskSchemaCache(str(tmpdir))
+    bundle = build_bundle([schema_class], disk_cache=first)
+    assert (first.hits, first.misses) == (0, 1)
+    second = DiskSchemaCache(str(tmpdir))
+    assert build_bundle([schema_class], disk_cache=second) == bundle
+    assert (second.hits, second.misses) == (1, 0)
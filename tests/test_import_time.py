@@ -0,0 +1,57 @@
+"""
+Regression tests of import cost, based on ``python -X importtime``.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(statement) -> dict:
+    """Get cumulative import times in microseconds by module names."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+
+def top_level(modules):
+    return {x.split('.')[0] for x in modules}
+
+
+@pytest.mark.parametrize('statement,excluded', [
+    ('import formencode_jsonschema', {'marshmallow', 'formencode'}),
+    ('import formencode_jsonschema.loader', {'marshmallow', 'formencode'}),
+    ('from formencode_jsonschema import typed', {'marshmallow'}),
+])
+def test_light_imports(statement, excluded):
+    modules = imported_modules(statement)
+    assert 'formencode_jsonschema' in modules
+    assert not top_level(modules) & excluded
+
+
+def test_lazy_attributes():
+    modules = imported_modules(
+        'import formencode_jsonschema as f; f.JSONSchema; f.converters')
+    assert {'marshmallow', 'formencode'} <= top_level(modules)
+    assert 'formencode_jsonschema.converters' in modules
+
+
+def test_lazy_attributes_are_exported():
+    import formencode_jsonschema
+    from formencode_jsonschema.schema import JSONSchema
+    assert formencode_jsonschema.JSONSchema is JSONSchema
+    assert 'compile_schema' in dir(formencode_jsonschema)
+    with pytest.raises(AttributeError):
+        formencode_jsonschema.missing_attribute
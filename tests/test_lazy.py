@@ -0,0 +1,72 @@
+import json
+
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema, compile_schema
+from formencode_jsonschema.converters import (ConversionContext,
+                                              get_converter_index,
+                                              DEFAULT_CONVERTERS)
+from formencode_jsonschema.encoding import encode_schema
+from formencode_jsonschema.lazy import (LazySchemaDocument, lazy_schema,
+                                        materialize)
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+
+
+class User(Schema):
+    username = v.PlainText(not_empty=True)
+    name = v.UnicodeString(not_empty=True)
+    description = v.UnicodeString(if_missing=None)
+    home = Address()
+
+
+class CountingContext(ConversionContext):
+    def __init__(self):
+        super().__init__(get_converter_index(DEFAULT_CONVERTERS))
+        self.converted = []
+
+    def convert_validator(self, validator):
+        self.converted.append(validator)
+        return super().convert_validator(validator)
+
+
+def test_lazy_properties():
+    context = CountingContext()
+    document = lazy_schema(User, context=context)
+    assert document['type'] == 'object'
+    assert set(document['properties']) == {'username', 'name', 'description',
+                                           'home'}
+    assert context.converted == []
+
+    assert document['properties']['name'] == {'type': 'string'}
+    assert document['properties']['name'] == {'type': 'string'}
+    assert context.converted == [User.fields['name']]
+    assert document.properties.is_converted('name')
+    assert not document.properties.is_converted('username')
+
+    assert sorted(document['required']) == ['home', 'name', 'username']
+    assert len(context.converted) == 1
+
+
+def test_lazy_materialize():
+    document = lazy_schema(User)
+    expected = compile_schema(User)
+    assert document.materialize() == expected
+    assert dict(document) == expected
+    assert document['definitions'].keys() == {'Address'}
+    assert json.loads(json.dumps(lazy_schema(User),
+                                 default=materialize)) == expected
+    assert (encode_schema(lazy_schema(User)).data ==
+            encode_schema(expected).data)
+
+
+def test_lazy_dump():
+    json_schema = JSONSchema(lazy=True)
+    result = json_schema.dump(User)
+    assert isinstance(result.data, LazySchemaDocument)
+    assert result.data.materialize() == compile_schema(User)
+    assert json.loads(json_schema.dumps(User).data) == compile_schema(User)
+    assert (json_schema.encode(User).etag ==
+            encode_schema(compile_schema(User)).etag)
@@ -0,0 +1,102 @@
+from formencode import Schema, validators as v, foreach
+
+from formencode_jsonschema import JSONSchema, compile_schema
+
+from .utils import compare_schema
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+    zip_code = v.UnicodeString(if_missing=None)
+
+
+class User(Schema):
+    name = v.UnicodeString(not_empty=True)
+    home = Address()
+    offices = foreach.ForEach(Address())
+    tags = foreach.ForEach(v.UnicodeString())
+
+
+ADDRESS = {
+    'type': 'object',
+    'required': ['street'],
+    'properties': {
+        'street': {'type': 'string'},
+        'zip_code': {'type': 'string'},
+    },
+}
+
+
+def test_nested_dump():
+    result = JSONSchema().dump(User())
+    definitions = result.data.pop('definitions')
+    compare_schema({
+        'type': 'object',
+        'required': ['name', 'home'],
+        'properties': {
+            'name': {'type': 'string'},
+            'home': {'$ref': '#/definitions/Address'},
+            'offices': {
+                'type': 'array',
+                'items': {'$ref': '#/definitions/Address'},
+            },
+            'tags': {
+                'type': 'array',
+                'items': {'type': 'string'},
+            },
+        },
+    }, result.data)
+    assert definitions.keys() == {'Address'}
+    compare_schema(ADDRESS, definitions['Address'])
+
+
+def test_definitions_are_omitted_without_nested_schemas():
+    result = JSONSchema().dump(Address())
+    assert 'definitions' not in result.data
+    result = JSONSchema(exclude=('type',)).dump(Address())
+    assert 'definitions' not in result.data
+
+
+def test_nested_dump_with_marshmallow():
+    result = JSONSchema(exclude=('type',)).dump(User())
+    assert result.data['definitions'].keys() == {'Address'}
+    assert result.data['properties']['home'] == {
+        '$ref': '#/definitions/Address',
+    }
+
+
+def test_self_reference():
+    node = Schema()
+    node.add_field('name', v.UnicodeString())
+    node.add_field('children', foreach.ForEach(node))
+    document = compile_schema(node)
+    assert document['properties']['children'] == {
+        'type': 'array',
+        'items': {'$ref': '#'},
+    }
+    assert 'definitions' not in document
+
+
+def test_mutual_reference():
+    parent = Schema()
+    child = Schema()
+    parent.add_field('child', child)
+    child.add_field('parent', parent)
+    child.add_field('sibling', child)
+    document = compile_schema(Schema(item=parent))
+    assert document['properties']['item'] == {'$ref': '#/definitions/Schema'}
+    assert document['definitions'] == {
+        'Schema': {
+            'type': 'object',
+            'required': ['child'],
+            'properties': {'child': {'$ref': '#/definitions/Schema2'}},
+        },
+        'Schema2': {
+            'type': 'object',
+            'required': ['parent', 'sibling'],
+            'properties': {
+                'parent': {'$ref': '#/definitions/Schema'},
+                'sibling': {'$ref': '#/definitions/Schema2'},
+            },
+        },
+    }
@@ -0,0 +1,90 @@
+from formencode import Schema, validators as v, foreach
+
+from formencode_jsonschema import compile_schema
+from formencode_jsonschema.openapi import ComponentsBuilder
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+
+
+class Location(Schema):
+    street = v.UnicodeString(not_empty=True)
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    home = Address()
+    offices = foreach.ForEach(Location())
+
+
+class UserUpdate(Schema):
+    home = Address()
+
+
+def test_components():
+    builder = ComponentsBuilder()
+    assert builder.add(UserCreate) == {
+        '$ref': '#/components/schemas/UserCreate',
+    }
+    assert builder.add(UserCreate()) == builder.add(UserCreate)
+    assert builder.add(Address) == {'$ref': '#/components/schemas/Address'}
+    assert builder.add(Location) == {'$ref': '#/components/schemas/Address'}
+    assert builder.add(UserUpdate, name='Update') == {
+        '$ref': '#/components/schemas/Update',
+    }
+    assert list(builder.schemas) == ['UserCreate', 'Address', 'Update']
+    assert builder.schemas['Address'] == compile_schema(Address)
+    assert builder.schemas['UserCreate']['properties']['offices'] == {
+        'type': 'array',
+        'items': {'$ref': '#/components/schemas/Address'},
+    }
+
+
+def test_components_are_converted_once():
+    builder = ComponentsBuilder()
+    converted = []
+    convert_object = builder.context.convert_object
+
+    def counting_convert_object(schema):
+        converted.append(schema)
+        return convert_object(schema)
+
+    builder.context.convert_object = counting_convert_object
+    builder.add_many([UserCreate, UserUpdate] * 10)
+    assert len(converted) == 4
+
+
+def test_recursive_components():
+    node = Schema()
+    node.add_field('children', foreach.ForEach(node))
+    other = Schema()
+    other.add_field('children', foreach.ForEach(other))
+    builder = ComponentsBuilder()
+    assert builder.add_many([node, other]) == [
+        {'$ref': '#/components/schemas/Schema'},
+        {'$ref': '#/components/schemas/Schema2'},
+    ]
+    assert builder.schemas['Schema2']['properties']['children'] == {
+        'type': 'array',
+        'items': {'$ref': '#/components/schemas/Schema2'},
+    }
+
+
+def test_build():
+    builder = ComponentsBuilder()
+    builder.add(UserUpdate)
+    base = {
+        'openapi': '3.0.3',
+        'components': {'securitySchemes': {'token': {}}},
+    }
+    document = builder.build(base)
+    assert document['openapi'] == '3.0.3'
+    assert document['components']['securitySchemes'] == {'token': {}}
+    assert set(document['components']['schemas']) == {'Address',
+                                                      'UserUpdate'}
+    assert 'schemas' not in base['components']
+    builder.add(UserCreate)
+    assert set(builder.build()['components']['schemas']) == {
+        'Address', 'UserUpdate', 'UserCreate',
+    }
@@ -0,0 +1,235 @@
+import pytest
+from formencode import Invalid, Schema, validators as v, foreach
+
+from formencode_jsonschema import typed
+from formencode_jsonschema.prevalidation import (PreValidated, PreValidator,
+                                                 validate_many)
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+    zip_code = v.UnicodeString(if_missing=None)
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    age = v.Int(if_missing=None)
+    admin = v.Bool()
+    home = Address()
+    offices = foreach.ForEach(Address())
+    birthday = typed.DateTyped(v.UnicodeString(), required=False)
+
+
+VALID = {
+    'username': 'john',
+    'age': 42,
+    'admin': False,
+    'home': {'street': 'Main St.'},
+    'offices': [{'street': 'Office St.', 'zip_code': '12345'}],
+    'birthday': '2000-01-01',
+}
+
+
+def test_prevalidate():
+    prevalidator = PreValidator.from_schema(UserCreate)
+    assert prevalidator.validate(VALID) == {}
+    assert prevalidator.is_valid(VALID)
+    assert prevalidator.validate(dict(VALID, age=None)) == {}
+
+    assert prevalidator.validate([1]) == {'': 'Expected object'}
+    assert prevalidator.validate({}) == {
+        'username': 'Missing value',
+        'home': 'Missing value',
+        'birthday': 'Missing value',
+    }
+    assert prevalidator.validate(dict(VALID, age='42', admin=1)) == {}
+    assert prevalidator.validate(dict(
+        VALID,
+        age='x',
+        home={},
+        offices=[{'street': 'Office St.'}, {'street': 1}, 'x'],
+        birthday='2000-13-01',
+    )) == {
+        'age': 'Expected integer',
+        'home.street': 'Missing value',
+        'offices-2': 'Expected object',
+    }
+    assert not prevalidator.is_valid(dict(VALID, home=None))
+
+
+def test_prevalidate_constraints():
+    prevalidator = PreValidator({
+        'type': 'object',
+        'required': ['name'],
+        'properties': {
+            'name': {'type': 'string', 'minLength': 2, 'maxLength': 4,
+                     'pattern': '^[a-z]+$'},
+            'score': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'kind': {'enum': ['a', 'b']},
+            'tags': {'type': 'array', 'maxItems': 1,
+                     'items': {'type': 'string'}},
+        },
+    })
+    assert prevalidator.validate({'name': 'abc', 'score': 0.5, 'kind': 'a',
+                                  'tags': ['x']}) == {}
+    assert prevalidator.validate({'name': 'a', 'score': 2, 'kind': 'c',
+                                  'tags': ['x', 'y']}) == {
+        'name': 'Must be at least 2 characters',
+        'score': 'Must be at most 1',
+        'kind': 'Value must be one of: a; b',
+        'tags': 'Must be at most 1 items',
+    }
+    assert prevalidator.validate({'name': 'ABC'}) == {
+        'name': 'The input is not valid',
+    }
+
+
+def test_prevalidate_recursive():
+    node = Schema()
+    node.add_field('name', v.UnicodeString(not_empty=True))
+    node.add_field('children', foreach.ForEach(node))
+    prevalidator = PreValidator.from_schema(node)
+    assert prevalidator.validate({
+        'name': 'root',
+        'children': [{'name': 'leaf', 'children': [{'name': 3}, {}]}],
+    }) == {'children-0.children-1.name': 'Missing value'}
+
+
+class Lenient(Schema):
+    number = v.Int(if_missing=None)
+    flag = v.Bool()
+    digits = v.Regex(r'^\d+$', strip=True, if_missing=None)
+    code = v.PlainText(if_missing=None)
+    nickname = v.UnicodeString(min=3, if_missing=None)
+    name = v.UnicodeString(max=4)
+    tags = foreach.ForEach(v.Number())
+
+
+@pytest.mark.parametrize('payload', [
+    {'name': 'john'},
+    {'name': 'john', 'number': '42', 'flag': 1},
+    {'name': 'john', 'number': ' 42 ', 'flag': 'no', 'digits': ' 12 '},
+    {'name': 'john', 'number': 4.5, 'tags': ['1e3', 2, True]},
+    {'name': 'john', 'number': True, 'nickname': ''},
+    {'name': 42, 'nickname': None, 'code': ''},
+    {'name': 'john', 'number': 'x'},
+    {'name': 'john', 'tags': [1, 'x']},
+    {'name': 'john', 'code': 'not plain!'},
+    {'name': 'john', 'code': 42},
+    {'name': 'john', 'nickname': 'jo'},
+    {'name': 'johnny'},
+    {'number': 1},
+    {},
+    [1],
+])
+def test_prevalidated_rejects_like_schema(payload):
+    schema = Lenient()
+    try:
+        schema.to_python(payload)
+    except Invalid:
+        rejected = True
+    else:
+        rejected = False
+    prevalidator = PreValidator.from_schema(schema)
+    # Only what formencode rejects is rejected. Empty values are left to
+    # formencode.
+    assert rejected or prevalidator.is_valid(payload)
+    validator = PreValidated(schema)
+    if rejected:
+        with pytest.raises(Invalid):
+            validator.to_python(payload)
+    else:
+        assert validator.to_python(payload) == schema.to_python(payload)
+
+
+def test_prevalidate_lenient():
+    prevalidator = PreValidator.from_schema(Lenient)
+    assert prevalidator.validate({
+        'name': 'johnny',
+        'number': 'x',
+        'code': 42,
+        'nickname': 'jo',
+        'tags': [1, 'x'],
+    }) == {
+        'name': 'Must be at most 4 characters',
+        'number': 'Expected integer',
+        'code': 'The input must be a string',
+        'nickname': 'Must be at least 3 characters',
+        'tags-1': 'Expected number',
+    }
+
+
+def test_prevalidate_python_patterns():
+    class Code(Schema):
+        code = v.Regex(r'^(?P<a>\d+)-(?P=a)$')
+        name = v.Regex(r'^[a-z]+$', regexOps=('I',), if_missing=None)
+
+    prevalidator = PreValidator.from_schema(Code)
+    assert prevalidator.validate({'code': '12-12', 'name': 'ABC'}) == {}
+    assert prevalidator.validate({'code': '12-13', 'name': 'A1'}) == {
+        'code': 'The input is not valid',
+        'name': 'The input is not valid',
+    }
+    assert PreValidated(Code()).to_python({'code': '1-1'}) == {
+        'code': '1-1', 'name': None,
+    }
+    # Patterns that python can not compile aren't checked.
+    assert PreValidator({'pattern': '^(?<a>x)$'}).validate('y') == {}
+
+
+def test_prevalidated_empty_payload():
+    class R(Schema):
+        name = v.UnicodeString(not_empty=True)
+
+    with pytest.raises(Invalid):
+        R().to_python({})
+    with pytest.raises(Invalid) as e:
+        PreValidated(R()).to_python({})
+    assert e.value.unpack_errors() == {'name': 'Missing value'}
+
+
+def test_prevalidated():
+    validator = PreValidated(UserCreate())
+    assert validator.to_python(VALID)['username'] == 'john'
+    with pytest.raises(Invalid) as e:
+        validator.to_python(dict(VALID, age='x', home={}))
+    assert e.value.unpack_errors() == {
+        'age': 'Expected integer',
+        'home.street': 'Missing value',
+    }
+    with pytest.raises(Invalid) as e:
+        validator.to_python('payload')
+    assert e.value.msg == 'Expected object'
+
+
+@pytest.mark.parametrize('workers,processes', [
+    (None, False),
+    (3, False),
+    (2, True),
+])
+def test_validate_many(workers, processes):
+    records = [
+        VALID,
+        dict(VALID, age='x'),
+        dict(VALID, username='not plain!'),
+        'record',
+    ] * 5
+    values, errors = validate_many(UserCreate(), records, workers=workers,
+                                   chunksize=3, processes=processes)
+    assert sorted(values) == list(range(0, 20, 4))
+    assert values[0] == UserCreate().to_python(VALID)
+    assert sorted(errors) == [x for x in range(20) if x % 4]
+    assert errors[1] == {'age': 'Expected integer'}
+    assert list(errors[2]) == ['username']
+    assert errors[3] == {'': 'Expected object'}
+
+
+def test_prevalidated_validate_many():
+    validator = PreValidated(UserCreate())
+    result = validator.validate_many([VALID, {}])
+    assert list(result.values) == [0]
+    assert result.errors[1] == {
+        'username': 'Missing value',
+        'home': 'Missing value',
+        'birthday': 'Missing value',
+    }
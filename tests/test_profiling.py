@@ -0,0 +1,47 @@
+from formencode import Schema, validators as v, compound
+
+from formencode_jsonschema import JSONSchema, compile_schema, typed
+from formencode_jsonschema.converters import (
+    AllValidatorConverter, LengthValidatorConverter, RegexValidatorConverter,
+    TypedValidatorConverter,
+)
+from formencode_jsonschema.profiling import ConversionStats
+
+
+class UserCreate(Schema):
+    username = v.PlainText(not_empty=True)
+    name = compound.All(v.UnicodeString(not_empty=True), v.PlainText())
+    really = typed.BooleanTyped(v.UnicodeString(), required=True)
+
+
+def test_converter_stats():
+    stats = ConversionStats()
+    result = JSONSchema(stats=stats).dump(UserCreate())
+    assert result.data == compile_schema(UserCreate())
+
+    regex = stats.converters[RegexValidatorConverter]
+    assert regex.convert_calls == 1
+    assert regex.is_required_calls == 1
+    assert (regex.can_convert_calls, regex.can_convert_hits) == (1, 1)
+    length = stats.converters[LengthValidatorConverter]
+    assert length.convert_calls == 1
+    assert (length.can_convert_calls, length.can_convert_hits) == (1, 1)
+    compound_stats = stats.converters[AllValidatorConverter]
+    assert (compound_stats.can_convert_calls,
+            compound_stats.can_convert_hits) == (1, 1)
+    assert stats.converters[TypedValidatorConverter].convert_calls == 1
+    assert 'AllValidatorConverter' in stats.report()
+
+
+def test_field_stats_and_callback():
+    seen = []
+    stats = ConversionStats(callback=seen.append)
+    JSONSchema(stats=stats).dump(UserCreate())
+    assert seen == stats.fields
+    depths = {x.name: x.depth for x in stats.fields}
+    assert depths == {'username': 1, 'name': 2, 'really': 1}
+    assert stats.max_depth == 2
+    assert {x.schema for x in stats.fields} == {'UserCreate'}
+    assert len(stats.slowest_fields(2)) == 2
+    stats.reset()
+    assert not stats.fields and not stats.converters
@@ -0,0 +1,138 @@
+import sys
+
+import pytest
+from formencode import Schema, validators as v
+
+from formencode_jsonschema import JSONSchema
+from formencode_jsonschema.converters import (DEFAULT_CONVERTERS,
+                                              SimpleValidatorConverter)
+from formencode_jsonschema.registry import (ConverterRegistry,
+                                            RegistryConverter,
+                                            default_registry)
+
+
+class Slug(v.UnicodeString):
+    pass
+
+
+class SlugConverter(SimpleValidatorConverter):
+    def __init__(self, pattern='^[a-z-]+$'):
+        super().__init__(Slug, str)
+        self.pattern = pattern
+
+    def convert(self, validator, delegate):
+        return {'type': 'string', 'pattern': self.pattern}
+
+
+class HighSlugConverter(SlugConverter):
+    def __init__(self):
+        super().__init__('^high$')
+
+
+def make_json_schema(registry):
+    class PluggableJSONSchema(JSONSchema):
+        __validator_converters__ = (
+            (RegistryConverter(registry),) + DEFAULT_CONVERTERS
+        )
+    return PluggableJSONSchema()
+
+
+@pytest.fixture
+def unload_plugins():
+    sys.modules.pop('tests.plugins', None)
+    yield
+    sys.modules.pop('tests.plugins', None)
+
+
+def test_registry_loads_lazily(unload_plugins):
+    registry = ConverterRegistry(group=None)
+    registry.register('formencode.validators.Email',
+                      'tests.plugins:EmailConverter')
+    json_schema = make_json_schema(registry)
+
+    class UserCreate(Schema):
+        name = v.UnicodeString()
+
+    json_schema.dump(UserCreate)
+    assert 'tests.plugins' not in sys.modules
+
+    UserCreate.add_field('email', v.Email())
+    properties = json_schema.dump(UserCreate).data['properties']
+    assert properties['email'] == {'type': 'string', 'format': 'email'}
+    assert 'tests.plugins' in sys.modules
+    assert [x.loaded for x in registry.find(v.Email)] == [True]
+
+
+def test_registry_priority():
+    registry = ConverterRegistry(group=None)
+    registry.register(v.UnicodeString, SlugConverter('^low$'))
+    registry.register(Slug, SlugConverter('^specific$'))
+    json_schema = make_json_schema(registry)
+    assert json_schema.convert_validator(Slug()) == {
+        'type': 'string', 'pattern': '^specific$',
+    }
+    registry.register(v.UnicodeString, SlugConverter('^high$'), priority=1)
+    assert make_json_schema(registry).convert_validator(Slug()) == {
+        'type': 'string', 'pattern': '^high$',
+    }
+    # Registered converters still check validator classes.
+    assert json_schema.convert_validator(v.UnicodeString()) == {
+        'type': 'string',
+    }
+
+
+class Token(v.FancyValidator):
+    pass
+
+
+class TokenConverter(SimpleValidatorConverter):
+    def __init__(self):
+        super().__init__(Token, str)
+
+
+def test_default_registry():
+    class Login(Schema):
+        token = Token()
+
+    default_registry.register(Token, TokenConverter)
+    assert JSONSchema().dump(Login).data['properties'] == {
+        'token': {'type': 'string'},
+    }
+
+
+class FakeDistribution(object):
+    name = 'slugs'
+    version = '1.0'
+
+
+class FakeEntryPoint(object):
+    def __init__(self, name, value, dist=None):
+        self.name = name
+        self.value = value
+        self.dist = dist
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.value
+
+
+def test_entry_points(monkeypatch):
+    entry_points = [
+        FakeEntryPoint('tests.test_registry.Slug', SlugConverter),
+        FakeEntryPoint('formencode.validators.UnicodeString@5',
+                       HighSlugConverter, FakeDistribution()),
+    ]
+    monkeypatch.setattr('formencode_jsonschema.registry._iter_entry_points',
+                        lambda group: entry_points)
+    registry = ConverterRegistry()
+    assert [x.priority for x in registry.find(Slug)] == [5, 0]
+    assert [x.distribution for x in registry.find(Slug)] == \
+        ['slugs==1.0', None]
+    assert [x.loads for x in entry_points] == [0, 0]
+    json_schema = make_json_schema(registry)
+    assert json_schema.convert_validator(Slug()) == {
+        'type': 'string', 'pattern': '^high$',
+    }
+    json_schema.convert_validator(Slug())
+    assert [x.loads for x in entry_points] == [1, 1]
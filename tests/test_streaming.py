@@ -0,0 +1,42 @@
+import json
+
+from formencode import Schema, validators as v, foreach
+
+from formencode_jsonschema import JSONSchema, compile_schema
+from formencode_jsonschema.streaming import iter_encoded, iter_schema
+
+
+class Address(Schema):
+    street = v.UnicodeString(not_empty=True)
+
+
+class User(Schema):
+    name = v.UnicodeString(not_empty=True, max=32)
+    nickname = v.UnicodeString(if_missing=None)
+    home = Address()
+    offices = foreach.ForEach(Address())
+
+
+def test_iter_schema():
+    chunks = list(iter_schema(User, buffer_size=0))
+    assert chunks[0] == '{"type":"object","properties":{'
+    assert chunks[1] == '"name":{"type":"string","maxLength":32}'
+    assert json.loads(''.join(chunks)) == compile_schema(User)
+    assert list(iter_schema(User)) == [''.join(chunks)]
+
+
+def test_iter_schema_is_lazy():
+    chunks = iter_schema(User, buffer_size=0)
+    next(chunks)
+    next(chunks)
+    assert next(chunks).startswith(',"nickname"')
+
+
+def test_iter_schema_without_fields():
+    assert json.loads(''.join(iter_schema(Schema))) == compile_schema(Schema)
+
+
+def test_stream():
+    data = b''.join(JSONSchema().stream(User, buffer_size=16))
+    assert data == b''.join(iter_encoded(User))
+    assert json.loads(data.decode('utf-8')) == compile_schema(User)
@@ -0,0 +1,96 @@
+import concurrent.futures
+import threading
+import time
+
+from formencode import Schema, validators as v, compound, foreach
+
+from formencode_jsonschema import JSONSchema, compile_schema, typed
+from formencode_jsonschema.cache import SchemaCache
+from formencode_jsonschema.converters import (
+    ConverterIndex, DEFAULT_CONVERTERS, SimpleValidatorConverter,
+)
+from formencode_jsonschema.utils import intern_fragment
+
+
+THREADS = 8
+
+
+def make_schemas(count):
+    schemas = []
+    for i in range(count):
+        address = type('Address{}'.format(i), (Schema,), {
+            'street': v.UnicodeString(not_empty=True, max=i + 1),
+        })
+        schemas.append(type('Schema{}'.format(i), (Schema,), {
+            'name': v.UnicodeString(not_empty=bool(i % 2)),
+            'age': v.Int(min=i),
+            'tags': foreach.ForEach(v.PlainText()),
+            'home': address(),
+            'nickname': compound.All(v.UnicodeString(), v.PlainText()),
+            'really': typed.BooleanTyped(v.UnicodeString(), required=True),
+        }))
+    return schemas
+
+
+def hammer(func, items, threads=THREADS):
+    """Call ``func`` with ``items`` from ``threads`` starting together."""
+    barrier = threading.Barrier(threads)
+
+    def work(_):
+        barrier.wait()
+        return [func(x) for x in items]
+
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(work, range(threads)))
+
+
+def test_concurrent_dumps():
+    schemas = make_schemas(40)
+    expected = [compile_schema(x) for x in schemas]
+    # Small cache to evict entries while others read them.
+    json_schema = JSONSchema(cache=SchemaCache(maxsize=8))
+
+    def dump(i):
+        return json_schema.dump(schemas[i]).data
+
+    for results in hammer(dump, list(range(len(schemas))) * 5):
+        assert results == expected * 5
+
+
+def test_concurrent_marshmallow_dumps():
+    schemas = make_schemas(20)
+    expected = [{'properties': compile_schema(x)['properties']}
+                for x in schemas]
+    json_schema = JSONSchema(only=('properties',))
+
+    def dump(schema):
+        return json_schema.dump(schema).data
+
+    for results in hammer(dump, schemas * 5):
+        assert results == expected * 5
+
+
+def test_index_classifies_class_once():
+    calls = []
+    lock = threading.Lock()
+
+    class Counting(SimpleValidatorConverter):
+        def match_class(self, validator_class):
+            with lock:
+                calls.append(validator_class)
+            time.sleep(0.001)
+            return super().match_class(validator_class)
+
+    index = ConverterIndex((Counting(v.Int, int),) + DEFAULT_CONVERTERS)
+    classes = [type('Int{}'.format(i), (v.Int,), {}) for i in range(20)]
+    results = hammer(index.candidates, classes)
+    assert all(x == results[0] for x in results)
+    assert sorted(calls, key=id) == sorted(classes, key=id)
+
+
+def test_concurrent_interning():
+    fragments = [{'type': 'string', 'maxLength': i} for i in range(200)]
+    results = hammer(intern_fragment, fragments)
+    for interned in results[1:]:
+        assert all(x is y for x, y in zip(interned, results[0]))
+
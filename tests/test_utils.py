@@ -0,0 +1,58 @@
+import copy
+import json
+import pickle
+
+import pytest
+from formencode import validators as v
+
+from formencode_jsonschema import typed
+from formencode_jsonschema.utils import (FrozenDict, FrozenList, freeze,
+                                         get_type_base, intern_fragment)
+
+
+def test_type_base_is_read_only():
+    base = get_type_base(str)
+    with pytest.raises(TypeError):
+        base['format'] = 'email'
+    with pytest.raises(TypeError):
+        base.update(format='email')
+    assert get_type_base(str) == {'type': 'string'}
+    mutable = base.copy()
+    mutable['format'] = 'email'
+    assert get_type_base(str) == {'type': 'string'}
+
+
+def test_freeze():
+    frozen = freeze({'type': 'string', 'enum': ['a', 'b'],
+                     'items': {'type': 'integer'}})
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen['enum'], FrozenList)
+    assert isinstance(frozen['items'], FrozenDict)
+    with pytest.raises(TypeError):
+        frozen['enum'].append('c')
+    assert freeze(frozen) is frozen
+    assert hash(frozen) == hash(freeze(json.loads(json.dumps(frozen))))
+
+
+def test_frozen_values_are_json_and_pickle_compatible():
+    frozen = freeze({'type': 'string', 'enum': ['a', 'b']})
+    assert json.loads(json.dumps(frozen)) == frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert copy.deepcopy(frozen) is frozen
+
+
+def test_intern_fragment():
+    fragment = intern_fragment({'type': 'string', 'enum': ['a', 'b']})
+    assert fragment is intern_fragment({'enum': ['a', 'b'],
+                                        'type': 'string'})
+    assert fragment['enum'] is intern_fragment(['a', 'b'])
+    assert intern_fragment({'minimum': 1}) is not \
+        intern_fragment({'minimum': True})
+    assert intern_fragment(get_type_base(str)) is get_type_base(str)
+
+
+def test_typed_validators_share_json_type():
+    first = typed.DateTyped(v.UnicodeString())
+    second = typed.DateTyped(v.UnicodeString(), required=True)
+    assert first.json_type is second.json_type
+    assert isinstance(first.json_type, FrozenDict)